@@ -2,27 +2,33 @@
 Count labels per question to check balance
 """
 
+import numpy as np
 import pandas as pd
-from collections import Counter
 
 print("=" * 80)
 print("LABEL DISTRIBUTION PER QUESTION")
 print("=" * 80)
 
-# Load data
-df = pd.read_csv('data/annotations/combined_annotations_with_text.csv')
+# Load data - annotator/question columns as category so the comparisons and
+# value_counts below run on integer codes instead of Python strings
+annotators = ['annotator_1', 'annotator_2', 'annotator_3']
+df = pd.read_csv(
+    'data/annotations/combined_annotations_with_text.csv',
+    dtype={c: 'category' for c in annotators + ['question']}
+)
 print(f"\n📂 Total samples: {len(df)}")
 print(f"📋 Columns: {list(df.columns)}")
 
-# Calculate consensus label (majority vote)
-def get_consensus_label(row):
-    votes = [row['annotator_1'], row['annotator_2'], row['annotator_3']]
-    counter = Counter(votes)
-    most_common = counter.most_common(1)[0]
-    return most_common[0]
-
+# Calculate consensus label (majority vote) - vectorized; ties fall back to
+# annotator_1, matching Counter.most_common's first-seen behavior
 print(f"\n⏳ Calculating consensus labels...")
-df['label'] = df.apply(get_consensus_label, axis=1)
+emotions = sorted(set().union(*(df[a].cat.categories for a in annotators)))
+for a in annotators:
+    df[a] = df[a].cat.set_categories(emotions)
+c1, c2, c3 = (df[a].cat.codes.to_numpy() for a in annotators)
+label_codes = np.where((c2 == c3) & (c1 != c2), c2, c1)
+# plain strings (not categorical) so value_counts only reports emotions present
+df['label'] = np.asarray(emotions, dtype=object)[label_codes]
 print(f"✅ Done")
 
 # Overall label distribution
@@ -6,7 +6,6 @@ Applies data preprocessing while keeping all samples
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from collections import Counter
 import re
 import unicodedata
 from pathlib import Path
@@ -15,10 +14,16 @@ print("=" * 80)
 print("DATA PROCESSING AND TRAIN/TEST SPLIT")
 print("=" * 80)
 
-# load data
+# load data - only the columns we use, annotators as category so dtype
+# inference is skipped and the vote below runs on int8 codes
 input_file = 'data/annotations/combined_annotations_with_text.csv'
+annotators = ['annotator_1', 'annotator_2', 'annotator_3']
 print(f"\n📂 Loading: {input_file}")
-df = pd.read_csv(input_file)
+df = pd.read_csv(
+    input_file,
+    usecols=['feedback_id', 'feedback_text', 'question'] + annotators,
+    dtype={c: 'category' for c in annotators}
+)
 print(f"✅ Loaded {len(df)} samples")
 
 # ============================================================================
@@ -28,15 +33,14 @@ print(f"\n{'='*80}")
 print("STEP 1: CALCULATING CONSENSUS LABELS")
 print(f"{'='*80}")
 
-# get consensus
-def get_consensus_label(row):
-    """majority vote from 3 annotators"""
-    votes = [row['annotator_1'], row['annotator_2'], row['annotator_3']]
-    counter = Counter(votes)
-    most_common = counter.most_common(1)[0]
-    return most_common[0]
-
-df['label'] = df.apply(get_consensus_label, axis=1)
+# get consensus - vectorized majority vote over the category codes (ties fall
+# back to annotator_1, matching Counter.most_common's first-seen behavior)
+emotions = sorted(set().union(*(df[a].cat.categories for a in annotators)))
+for a in annotators:
+    df[a] = df[a].cat.set_categories(emotions)
+a1, a2, a3 = (df[a].cat.codes.to_numpy() for a in annotators)
+label_codes = np.where((a2 == a3) & (a1 != a2), a2, a1)
+df['label'] = np.asarray(emotions, dtype=object)[label_codes]
 print(f"✅ Consensus labels calculated")
 
 print(f"\n📊 Label Distribution:")
@@ -150,15 +154,11 @@ print(f"\n{'='*80}")
 print("STEP 5: PREPARING FINAL FORMAT")
 print(f"{'='*80}")
 
-# select cols
+# select cols - the projection already copies, so no extra .copy() pass
 columns_to_keep = ['feedback', 'question', 'label', 'label_id']
 
-train_final = train_df[columns_to_keep].copy()
-test_final = test_df[columns_to_keep].copy()
-
-# reset index
-train_final = train_final.reset_index(drop=True)
-test_final = test_final.reset_index(drop=True)
+train_final = train_df[columns_to_keep].reset_index(drop=True)
+test_final = test_df[columns_to_keep].reset_index(drop=True)
 
 print(f"✅ Final format prepared")
 print(f"   Columns: {list(train_final.columns)}")
@@ -172,22 +172,22 @@ print(f"{'='*80}")
 
 output_dir = Path('data/annotations')
 
-# save train
+# save train - chunked writes keep the serialization buffer bounded
 train_output = output_dir / 'train_data.csv'
-train_final.to_csv(train_output, index=False)
+train_final.to_csv(train_output, index=False, chunksize=10000)
 print(f"\n✅ Training data saved: {train_output}")
 print(f"   Samples: {len(train_final)}")
 
 # save test
 test_output = output_dir / 'test_data.csv'
-test_final.to_csv(test_output, index=False)
+test_final.to_csv(test_output, index=False, chunksize=10000)
 print(f"✅ Test data saved: {test_output}")
 print(f"   Samples: {len(test_final)}")
 
 # save full
 full_output = output_dir / 'processed_full.csv'
-df[['feedback_id', 'feedback', 'question', 'label', 'label_id', 
-    'annotator_1', 'annotator_2', 'annotator_3']].to_csv(full_output, index=False)
+df[['feedback_id', 'feedback', 'question', 'label', 'label_id',
+    'annotator_1', 'annotator_2', 'annotator_3']].to_csv(full_output, index=False, chunksize=10000)
 print(f"✅ Full processed data saved: {full_output}")
 print(f"   Samples: {len(df)}")
 
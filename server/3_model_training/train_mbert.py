@@ -1,14 +1,15 @@
 # Fine-tune mBERT for Emotion Classification
 
 import os
-os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # Disable CUDA completely
+if os.environ.get('FORCE_CPU') == '1':
+    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # Disable CUDA (e.g. GPU unsupported by this torch build)
 
 import pandas as pd
 import numpy as np
 import torch
 import re
 from torch.utils.data import Dataset
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer, EarlyStoppingCallback
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, TrainingArguments, Trainer, EarlyStoppingCallback, DataCollatorWithPadding
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix
 import time
 from pathlib import Path
@@ -16,19 +17,20 @@ from comprehensive_visualizations import ComprehensiveVisualizer
 
 class EmotionDataset(Dataset):
     def __init__(self, texts, labels, tokenizer, max_length=128):
-        self.texts = texts
+        # Tokenize the whole corpus once up front; __getitem__ then just
+        # slices instead of re-tokenizing every text each epoch. No padding
+        # here - the DataCollatorWithPadding pads per batch instead of
+        # burning attention FLOPs on 128-token pads for short feedback
+        encodings = tokenizer([str(t) for t in texts], add_special_tokens=True, max_length=max_length, truncation=True)
+        self.input_ids = encodings['input_ids']
+        self.attention_mask = encodings['attention_mask']
         self.labels = labels
-        self.tokenizer = tokenizer
-        self.max_length = max_length
-    
+
     def __len__(self):
-        return len(self.texts)
-    
+        return len(self.labels)
+
     def __getitem__(self, idx):
-        text = str(self.texts[idx])
-        label = self.labels[idx]
-        encoding = self.tokenizer(text, add_special_tokens=True, max_length=self.max_length, padding='max_length', truncation=True, return_tensors='pt')
-        return {'input_ids': encoding['input_ids'].flatten(), 'attention_mask': encoding['attention_mask'].flatten(), 'labels': torch.tensor(label, dtype=torch.long)}
+        return {'input_ids': self.input_ids[idx], 'attention_mask': self.attention_mask[idx], 'labels': self.labels[idx]}
 
 def compute_metrics(pred):
     labels = pred.label_ids
@@ -64,10 +66,16 @@ def main():
     print('FINE-TUNING mBERT FOR EMOTION CLASSIFICATION')
     print('='*80)
     
-    # Force CPU - GPU too new (RTX 5060 sm_120 not supported by PyTorch yet)
-    device = torch.device('cpu')
-    print(f'Device: {device} (GPU sm_120 not yet supported - waiting for PyTorch update)')
-    print('Training will take ~50-60 minutes on CPU')
+    # Use the GPU when available; FORCE_CPU=1 disables CUDA up top
+    # (e.g. RTX 5060 sm_120 not supported by older PyTorch builds)
+    has_cuda = torch.cuda.is_available()
+    device = torch.device('cuda' if has_cuda else 'cpu')
+    # bf16 on CPU needs AVX512-BF16; probe via torch's (version-dependent) check
+    bf16_check = getattr(torch.cpu, '_is_avx512_bf16_supported', None)
+    cpu_bf16 = bool(bf16_check()) if (not has_cuda and bf16_check) else False
+    print(f'Device: {device} (fp16={has_cuda}, bf16={cpu_bf16})')
+    if not has_cuda:
+        print('Training will take ~50-60 minutes on CPU')
     print()
     
     print('Loading data...')
@@ -100,8 +108,8 @@ def main():
     training_args = TrainingArguments(
         output_dir=output_dir,
         num_train_epochs=5,
-        per_device_train_batch_size=8,
-        per_device_eval_batch_size=16,
+        per_device_train_batch_size=32 if has_cuda else 8,
+        per_device_eval_batch_size=64 if has_cuda else 16,
         learning_rate=2e-5,
         warmup_ratio=0.1,
         weight_decay=0.01,
@@ -111,10 +119,14 @@ def main():
         load_best_model_at_end=True,
         metric_for_best_model='f1',
         report_to='none',
-        fp16=False
+        use_cpu=not has_cuda,
+        fp16=has_cuda,             # half the bytes moved per step on GPU
+        bf16=cpu_bf16,             # mixed precision on AVX512-BF16 CPUs
+        tf32=True if has_cuda else None,
+        dataloader_num_workers=max(1, (os.cpu_count() or 2) // 2)
     )
     
-    trainer = Trainer(model=model, args=training_args, train_dataset=train_dataset, eval_dataset=val_dataset, compute_metrics=compute_metrics, callbacks=[EarlyStoppingCallback(early_stopping_patience=2)])
+    trainer = Trainer(model=model, args=training_args, train_dataset=train_dataset, eval_dataset=val_dataset, compute_metrics=compute_metrics, data_collator=DataCollatorWithPadding(tokenizer, pad_to_multiple_of=8), callbacks=[EarlyStoppingCallback(early_stopping_patience=2)])
     
     print('='*80)
     print('STARTING TRAINING')
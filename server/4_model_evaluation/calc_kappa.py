@@ -24,8 +24,15 @@ print("=" * 80)
 print("COHEN'S KAPPA INTER-ANNOTATOR AGREEMENT")
 print("=" * 80)
 
-# Load data
-df = pd.read_csv('data/annotations/combined_annotations_with_text.csv')
+# Load data - annotators as category sharing one label set so the agreement
+# masks below compare int8 codes instead of Python strings
+annotators = ['annotator_1', 'annotator_2', 'annotator_3']
+df = pd.read_csv(
+    'data/annotations/combined_annotations_with_text.csv',
+    dtype={c: 'category' for c in annotators}
+)
+emotions = sorted(set().union(*(df[a].cat.categories for a in annotators)))
+codes = {a: df[a].cat.set_categories(emotions).cat.codes.to_numpy() for a in annotators}
 print(f"\n📂 Loaded: {len(df)} annotations")
 
 # Calculate Cohen's Kappa for each pair
@@ -42,7 +49,7 @@ kappas = []
 for ann1, ann2, pair_name in pairs:
     kappa = cohen_kappa_score(df[ann1], df[ann2])
     interpretation = interpret_kappa(kappa)
-    agreement = (df[ann1] == df[ann2]).sum()
+    agreement = int((codes[ann1] == codes[ann2]).sum())
     agreement_pct = (agreement / len(df)) * 100
     kappas.append(kappa)
     
@@ -58,13 +65,13 @@ print(f"AVERAGE COHEN'S KAPPA: {avg_kappa:.4f}")
 print(f"Interpretation: {interpret_kappa(avg_kappa)}")
 print(f"{'='*80}")
 
-# Perfect agreement
-perfect = df[(df['annotator_1'] == df['annotator_2']) & 
-             (df['annotator_2'] == df['annotator_3'])]
-perfect_pct = (len(perfect) / len(df)) * 100
+# Perfect agreement - single vectorized pass over the int8 code arrays
+perfect_count = int(((codes['annotator_1'] == codes['annotator_2']) &
+                     (codes['annotator_2'] == codes['annotator_3'])).sum())
+perfect_pct = (perfect_count / len(df)) * 100
 
 print(f"\n✅ PERFECT AGREEMENT (All 3 annotators agree)")
-print(f"   {len(perfect)}/{len(df)} ({perfect_pct:.2f}%)")
+print(f"   {perfect_count}/{len(df)} ({perfect_pct:.2f}%)")
 
 print(f"\n📖 INTERPRETATION GUIDE:")
 print(f"   0.81-1.00: Almost perfect agreement")
@@ -46,7 +46,7 @@ def predict_batch(model, tokenizer, texts, batch_size=32):
             return_tensors='pt'
         )
         
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = model(**inputs)
             predictions = torch.argmax(outputs.logits, dim=1).numpy()
             all_predictions.extend(predictions)
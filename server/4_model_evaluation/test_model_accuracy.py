@@ -10,7 +10,6 @@ import pandas as pd
 import numpy as np
 import torch
 import re
-from torch.utils.data import Dataset
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, confusion_matrix, classification_report
 import sys
@@ -29,35 +28,6 @@ def preprocess_text(text):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-class EmotionDataset(Dataset):
-    def __init__(self, texts, labels, tokenizer, max_length=128):
-        self.texts = texts
-        self.labels = labels
-        self.tokenizer = tokenizer
-        self.max_length = max_length
-    
-    def __len__(self):
-        return len(self.texts)
-    
-    def __getitem__(self, idx):
-        text = self.texts[idx]
-        label = self.labels[idx]
-        
-        encoding = self.tokenizer(
-            text,
-            add_special_tokens=True,
-            max_length=self.max_length,
-            padding='max_length',
-            truncation=True,
-            return_tensors='pt'
-        )
-        
-        return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'labels': torch.tensor(label, dtype=torch.long)
-        }
-
 def test_model(model_name):
     """Test a specific model and display results"""
     
@@ -97,27 +67,29 @@ def test_model(model_name):
         print(f'❌ Error loading model: {e}')
         return
     
-    # Create dataset
-    test_dataset = EmotionDataset(test_texts, test_labels, tokenizer)
-    
-    # Get predictions
+    # Get predictions - batched forward passes under inference_mode (cheaper
+    # than no_grad) with dynamic padding per batch instead of one padded
+    # forward pass per sample
     print('\nEvaluating model...')
     predictions_list = []
-    true_labels_list = []
-    
-    with torch.no_grad():
-        for i in range(len(test_dataset)):
-            item = test_dataset[i]
-            input_ids = item['input_ids'].unsqueeze(0)
-            attention_mask = item['attention_mask'].unsqueeze(0)
-            
-            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+    batch_size = 32
+
+    with torch.inference_mode():
+        for i in range(0, len(test_texts), batch_size):
+            inputs = tokenizer(
+                test_texts[i:i+batch_size],
+                add_special_tokens=True,
+                max_length=128,
+                padding=True,
+                truncation=True,
+                return_tensors='pt'
+            )
+            outputs = model(**inputs)
             predictions_list.append(outputs.logits.cpu().numpy())
-            true_labels_list.append(item['labels'].item())
-    
+
     predictions_array = np.vstack(predictions_list)
     pred_labels = predictions_array.argmax(-1)
-    true_labels = np.array(true_labels_list)
+    true_labels = np.array(test_labels)
     
     emotion_labels = ['joy', 'satisfaction', 'acceptance', 'boredom', 'disappointment']
     
@@ -184,13 +156,12 @@ def test_single_text(model_name, text):
         processed_text,
         add_special_tokens=True,
         max_length=128,
-        padding='max_length',
         truncation=True,
         return_tensors='pt'
     )
-    
+
     # Get prediction
-    with torch.no_grad():
+    with torch.inference_mode():
         outputs = model(input_ids=encoding['input_ids'], attention_mask=encoding['attention_mask'])
         probs = torch.nn.functional.softmax(outputs.logits, dim=1).squeeze()
         pred_label = outputs.logits.argmax(-1).item()
@@ -169,7 +169,8 @@ specific_courses = ['CC 100', 'CC 103', 'CC 104', 'CC 105', 'IT 131', 'IT 135']
 specific_data = all_feedback[all_feedback['Course_code'].isin(specific_courses)]
 
 fig, ax = plt.subplots(figsize=(14, 8))
-sentiment_by_course = specific_data.groupby(['Course_code', 'Label']).size().unstack(fill_value=0)
+# crosstab pivots in one pass instead of groupby + unstack
+sentiment_by_course = pd.crosstab(specific_data['Course_code'], specific_data['Label'])
 sentiment_by_course_pct = sentiment_by_course.div(sentiment_by_course.sum(axis=1), axis=0) * 100
 
 sentiment_by_course_pct.plot(kind='bar', stacked=True, ax=ax, 
@@ -185,7 +186,7 @@ print(f'✅ Saved: {results_dir}/3_key_courses_sentiment_distribution.png')
 plt.close()
 
 # Visualization 4: Heatmap of Sentiment by Course
-pivot_data = all_feedback.groupby(['Course_code', 'Label']).size().unstack(fill_value=0)
+pivot_data = pd.crosstab(all_feedback['Course_code'], all_feedback['Label'])
 pivot_data_pct = pivot_data.div(pivot_data.sum(axis=1), axis=0) * 100
 
 # Select top 20 courses by feedback count
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.26 on 2025-12-08 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_feedback_emotion_best_aspect_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseassignment',
+            index=models.Index(fields=['is_active', 'semester', 'academic_year'], name='ca_active_sem_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['status', 'course_assignment'], name='fb_status_ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('status', 'submitted')), fields=['created_at'], name='fb_submitted_created_idx'),
+        ),
+    ]
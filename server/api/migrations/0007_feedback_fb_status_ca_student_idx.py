@@ -0,0 +1,17 @@
+# Generated by Django 4.2.26 on 2025-12-08 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_courseassignment_ca_active_sem_year_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['status', 'course_assignment', 'student'], name='fb_status_ca_student_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ GPT-Neo based insight generator for course improvement recommendations
 Uses GPT-Neo model to generate actionable insights from LDA topics and emotion analysis
 """
 
+import functools
 import torch
 from transformers import GPT2LMHeadModel, GPT2Tokenizer
 import logging
@@ -305,12 +306,9 @@ class InsightGenerator:
         return icon_map.get(category, 'info')
 
 
-# Singleton instance
-_insight_generator = None
-
+# lru_cache gives the singleton without the global/None dance and keeps
+# repeat callers from ever re-running the model load
+@functools.lru_cache(maxsize=1)
 def get_insight_generator():
     """Get or create the insight generator singleton"""
-    global _insight_generator
-    if _insight_generator is None:
-        _insight_generator = InsightGenerator()
-    return _insight_generator
+    return InsightGenerator()
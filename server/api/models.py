@@ -80,6 +80,11 @@ class CourseAssignment(models.Model):
         verbose_name = 'Course Assignment'
         verbose_name_plural = 'Course Assignments'
         unique_together = ['course', 'instructor', 'year_level', 'section', 'semester', 'academic_year']
+        indexes = [
+            # Analytics endpoints filter assignments by active flag + term
+            models.Index(fields=['is_active', 'semester', 'academic_year'],
+                         name='ca_active_sem_year_idx'),
+        ]
     
     def __str__(self):
         section_str = f"Section {self.section}" if self.section else "All Sections"
@@ -376,6 +381,20 @@ class Feedback(models.Model):
         verbose_name = 'Feedback'
         verbose_name_plural = 'Feedback'
         unique_together = ['student', 'course_assignment', 'feedback_session']
+        indexes = [
+            # Every analytics/report queryset narrows on status first, then
+            # joins through course_assignment
+            models.Index(fields=['status', 'course_assignment'],
+                         name='fb_status_ca_idx'),
+            # Partial index for the 30-day submissions-over-time scan
+            models.Index(fields=['created_at'],
+                         name='fb_submitted_created_idx',
+                         condition=models.Q(status='submitted')),
+            # Respondent lookups filter status + assignment + student; with
+            # student in the index the check never touches the table
+            models.Index(fields=['status', 'course_assignment', 'student'],
+                         name='fb_status_ca_student_idx'),
+        ]
     
     def __str__(self):
         return f"Feedback from {self.student.email} for {self.course_assignment.course.code}"
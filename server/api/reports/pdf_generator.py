@@ -413,7 +413,8 @@ def generate_feedback_report_pdf(feedback_qs, filters, user):
         positive_comments = []
         improvement_comments = []
         
-        for fb in feedback_qs.select_related('student', 'course_assignment__course'):
+        # Related rows are pre-selected by the caller; stream in chunks to cap memory
+        for fb in feedback_qs.iterator(chunk_size=1000):
             if fb.best_teaching_aspect and len(fb.best_teaching_aspect) > 20:
                 positive_comments.append(fb.best_teaching_aspect)
             if fb.suggested_changes and len(fb.suggested_changes) > 20:
@@ -1,23 +1,110 @@
 from django.shortcuts import render
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.utils.decorators import method_decorator
-from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+import numpy as np
 import pandas as pd
+import hashlib
 import os
 import json
+import re
 from datetime import datetime
 from .models import Course, CourseAssignment, Enrollment, FeedbackSession, Feedback
 from authentication.models import User
 from .ml_models.emotion_predictor import predict_emotions_batch
 import logging
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=1)
+def _load_sentiment_lists():
+    """Read the positive/negative word lists once and serve them from memory."""
+    base_path = Path(__file__).parent.parent / 'data' / 'annotations'
+
+    def read_words(filename):
+        path = base_path / filename
+        if not path.exists():
+            logger.error(f"Sentiment words file not found: {path}")
+            return ()
+        lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
+        return tuple(line.strip() for line in lines if line.strip() and not line.startswith(';'))
+
+    return read_words('positive-words.txt'), read_words('negative-words.txt')
+
+
+@lru_cache(maxsize=1)
+def _sentiment_words_payload():
+    """Pre-serialized JSON body for get_sentiment_words (~50KB, never changes)."""
+    positive_words, negative_words = _load_sentiment_lists()
+    return json.dumps({
+        'positive': list(positive_words),
+        'negative': list(negative_words),
+        'count': {
+            'positive': len(positive_words),
+            'negative': len(negative_words)
+        }
+    }).encode()
+
+
+def _sentiment_words_etag(request):
+    """ETag for the (static at runtime) sentiment word lists."""
+    positive_words, negative_words = _load_sentiment_lists()
+    return hashlib.md5(f"{len(positive_words)}:{len(negative_words)}".encode()).hexdigest()
+
+
+def _courses_list_etag(request):
+    """ETag for the course list: newest Course change plus the requesting
+    user's identity, since the list is RBAC-filtered per user and a purely
+    global tag would let one user's cached 304 serve another's list."""
+    latest = Course.objects.aggregate(m=Max('updated_at'))['m']
+    if latest is None:
+        return None
+    user = request.user
+    key = (f"{latest.isoformat()}:{user.pk}:"
+           f"{getattr(user, 'role', '')}:{getattr(user, 'admin_subrole', '')}")
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _rbac_department_filter(role, admin_subrole, department=None,
+                            field_prefix='course_assignment__department'):
+    """
+    Build the department Q filter used by the RBAC ladders.
+
+    A dean may override their unrestricted view with an explicit department
+    filter; department heads are always restricted to their own department
+    (IT heads also see ICT). Returns None when no restriction applies.
+    Cached on the argument strings so repeated requests reuse the same Q.
+    """
+    if department and role == 'admin' and admin_subrole == 'dean':
+        if department == 'CS':
+            return Q(**{field_prefix: 'CS'})
+        if department == 'IT':
+            return Q(**{field_prefix: 'IT'}) | Q(**{field_prefix: 'ICT'})
+        if department == 'ACT':
+            return Q(**{field_prefix: 'ACT'})
+        return None
+    if role == 'admin' and admin_subrole:
+        if admin_subrole == 'dept_head_cs':
+            return Q(**{field_prefix: 'CS'})
+        if admin_subrole == 'dept_head_it':
+            return Q(**{field_prefix: 'IT'}) | Q(**{field_prefix: 'ICT'})
+        if admin_subrole == 'dept_head_act':
+            return Q(**{field_prefix: 'ACT'})
+    return None
+
 def load_training_data(request):
     # Path to your training data file
     data_path = os.path.join('server', 'data', 'Data Sample Training.xlsx - Annotator 1.csv')
@@ -25,51 +112,36 @@ def load_training_data(request):
         df = pd.read_csv(data_path)
         
         # Create separate rows for each feedback type with its corresponding label
-        rows = []
-        
-        for index, row in df.iterrows():
-            # Add suggested_changes row (include even if empty)
-            feedback_text = row['suggested_changes'] if pd.notna(row['suggested_changes']) else 'No response'
-            rows.append({
-                'question': 'suggested_changes',
-                'feedback': feedback_text,
-                'label': row['suggested_changes_label'],
-            })
-            
-            # Add best_teaching_aspect row (include even if empty)
-            feedback_text = row['best_teaching_aspect'] if pd.notna(row['best_teaching_aspect']) else 'No response'
-            rows.append({
-                'question': 'best_teaching_aspect',
-                'feedback': feedback_text,
-                'label': row['best_teaching_aspect_label'],
-            })
-            
-            # Add least_teaching_aspect row (include even if empty)
-            feedback_text = row['least_teaching_aspect'] if pd.notna(row['least_teaching_aspect']) else 'No response'
-            rows.append({
-                'question': 'least_teaching_aspect',
-                'feedback': feedback_text,
-                'label': row['least_teaching_aspect_label'],
-            })
-            
-            # Add further_comments row (include even if empty)
-            feedback_text = row['further_comments'] if pd.notna(row['further_comments']) else 'No response'
-            rows.append({
-                'question': 'further_comments',
-                'feedback': feedback_text,
-                'label': row['further_comments_label'],
+        # (vectorized reshape of the question/label column pairs - no iterrows)
+        question_columns = [
+            'suggested_changes',
+            'best_teaching_aspect',
+            'least_teaching_aspect',
+            'further_comments',
+        ]
+        parts = [
+            pd.DataFrame({
+                'question': column,
+                'feedback': df[column].fillna('No response'),
+                'label': df[f'{column}_label'],
             })
-        
-        # Create new DataFrame with separate rows
-        training_df = pd.DataFrame(rows)
+            for column in question_columns
+        ]
+        training_df = pd.concat(parts, ignore_index=True)
         
         print(training_df.head())  # Show first 5 rows in terminal
         print(training_df.info())    # Show column info and data types
-        
-        # Convert ALL DataFrame rows to HTML table for browser viewing
-        html_table = training_df.to_html(classes='table table-striped', table_id='data-preview')
-        
-        html_content = f"""
+
+        # Cap the browser preview instead of rendering the full frame to HTML
+        # (?limit= overrides; 0 dumps everything)
+        try:
+            limit = int(request.GET.get('limit', 200))
+        except (TypeError, ValueError):
+            limit = 200
+        preview_df = training_df.head(limit) if limit > 0 else training_df
+
+        def render_preview():
+            yield f"""
         <html>
         <head>
             <title>Data Preview</title>
@@ -84,14 +156,17 @@ def load_training_data(request):
         <body>
             <div class="info">
                 <p><strong>Shape:</strong> {training_df.shape[0]} rows, {training_df.shape[1]} columns</p>
+                <p><strong>Showing:</strong> {len(preview_df)} rows (adjust with ?limit=, 0 for all)</p>
                 <p><strong>Columns:</strong> {', '.join(training_df.columns)}</p>
             </div>
-            {html_table}
+        """
+            yield preview_df.to_html(classes='table table-striped', table_id='data-preview')
+            yield """
         </body>
         </html>
         """
-        
-        return HttpResponse(html_content)
+
+        return StreamingHttpResponse(render_preview())
     except Exception as e:
         return JsonResponse({'error': str(e)})
 
@@ -570,32 +645,10 @@ def get_feedback_analytics(request):
     # Base queryset
     feedback_qs = Feedback.objects.filter(status='submitted')
     
-    # Apply department filter for dean (overrides RBAC)
-    if department and user.role == 'admin' and user.admin_subrole == 'dean':
-        if department == 'CS':
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif department == 'IT':
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif department == 'ACT':
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
-    # RBAC: Department head restrictions (only if no department filter)
-    elif user.role == 'admin' and user.admin_subrole:
-        if user.admin_subrole == 'dept_head_cs':
-            # CS Department Head: only CS courses
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif user.admin_subrole == 'dept_head_it':
-            # IT Department Head: IT and ICT courses
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif user.admin_subrole == 'dept_head_act':
-            # ACT Department Head: only ACT courses
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
-        # dean has no restrictions (sees all)
+    # RBAC / dean department override (see _rbac_department_filter)
+    dept_q = _rbac_department_filter(user.role, user.admin_subrole, department)
+    if dept_q is not None:
+        feedback_qs = feedback_qs.filter(dept_q)
     
     # Apply filters
     if semester and semester != 'all':
@@ -799,32 +852,10 @@ def get_emotion_analytics(request):
     # Base queryset
     feedback_qs = Feedback.objects.filter(status='submitted')
     
-    # Apply department filter for dean (overrides RBAC)
-    if department and user.role == 'admin' and user.admin_subrole == 'dean':
-        if department == 'CS':
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif department == 'IT':
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif department == 'ACT':
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
-    # RBAC: Department head restrictions (only if no department filter)
-    elif user.role == 'admin' and user.admin_subrole:
-        if user.admin_subrole == 'dept_head_cs':
-            # CS Department Head: only CS courses
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif user.admin_subrole == 'dept_head_it':
-            # IT Department Head: IT and ICT courses
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif user.admin_subrole == 'dept_head_act':
-            # ACT Department Head: only ACT courses
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
-        # dean has no restrictions (sees all)
+    # RBAC / dean department override (see _rbac_department_filter)
+    dept_q = _rbac_department_filter(user.role, user.admin_subrole, department)
+    if dept_q is not None:
+        feedback_qs = feedback_qs.filter(dept_q)
     
     # Apply filters
     if semester and semester != 'all':
@@ -1001,6 +1032,34 @@ def generate_topic_insights(keywords, emotion_dist=None):
     return insights
 
 
+# Faculty names to filter out of topic keywords (all variations)
+_FACULTY_NAME_STOPWORDS = frozenset({
+    'salimar', 'salih', 'sal', 'sir', 'maam', "ma'am", 'mr', 'mrs', 'ms',
+    'jaydee', 'ballaho', 'lucy', 'felix', 'sadiwa', 'odon', 'maravilla',
+    'arip', 'chris', 'sherard', 'lines', 'marjory', 'rojas', 'marj',
+    'rhamirl', 'jaafar', 'rham', 'ram', 'jlo', 'edios', 'jaylo',
+    'mark', 'flores', 'yara', 'professor', 'prof', 'teacher', 'instructor'
+})
+
+_TOPIC_PATTERNS = {
+    'Teaching Quality': ['teaching', 'instructor', 'professor', 'explain', 'explains', 'clear', 'understanding', 'lectures', 'lecture'],
+    'Course Content': ['content', 'material', 'materials', 'topics', 'subject', 'curriculum', 'knowledge', 'learning'],
+    'Assignments & Workload': ['assignments', 'homework', 'workload', 'tasks', 'work', 'projects', 'assignment', 'deadline'],
+    'Class Engagement': ['class', 'interactive', 'activities', 'discussions', 'participate', 'engaging', 'interesting', 'attention'],
+    'Assessment & Grading': ['exam', 'exams', 'test', 'tests', 'grade', 'grading', 'feedback', 'assessment', 'evaluation'],
+    'Time Management': ['time', 'schedule', 'pace', 'pacing', 'deadlines', 'timing', 'duration', 'hours'],
+    'Learning Support': ['help', 'support', 'guidance', 'office', 'hours', 'questions', 'clarification', 'assistance'],
+    'Course Organization': ['organized', 'structure', 'syllabus', 'schedule', 'plan', 'organization'],
+    'Student Experience': ['experience', 'enjoy', 'enjoyed', 'appreciate', 'liked', 'love', 'positive', 'good'],
+    'Communication': ['communication', 'responds', 'response', 'email', 'available', 'accessible', 'communicates']
+}
+
+# Flat keyword -> category index so naming a topic is one hash lookup per
+# keyword; the old nested substring scan also produced false hits
+# ('plan' in 'plane')
+_TOPIC_CATEGORY_MAP = {w: cat for cat, ws in _TOPIC_PATTERNS.items() for w in ws}
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_topic_modeling_data(request):
@@ -1008,7 +1067,7 @@ def get_topic_modeling_data(request):
     import pandas as pd
     import json
     from pathlib import Path
-    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.feature_extraction.text import CountVectorizer, ENGLISH_STOP_WORDS
     from sklearn.decomposition import LatentDirichletAllocation
     
     user = request.user
@@ -1048,81 +1107,76 @@ def get_topic_modeling_data(request):
         if academic_year and academic_year != 'all':
             feedbacks = feedbacks.filter(course_assignment__academic_year=academic_year)
         
-        # Check if we have enough data
-        if feedbacks.count() < 10:
+        # Check if we have enough data - one COUNT(*) instead of two
+        feedback_count = feedbacks.count()
+        if feedback_count < 10:
             return Response({
-                'error': f'Need at least 10 feedbacks for topic modeling. Currently have {feedbacks.count()}.',
+                'error': f'Need at least 10 feedbacks for topic modeling. Currently have {feedback_count}.',
                 'topics': [],
                 'topic_distribution': {},
                 'total_topics': 0
             })
-        
-        # Combine all text feedback fields
-        feedback_data = []
-        for fb in feedbacks:
-            combined_text = ' '.join(filter(None, [
-                fb.suggested_changes or '',
-                fb.best_teaching_aspect or '',
-                fb.least_teaching_aspect or '',
-                fb.further_comments or ''
-            ]))
-            
+
+        # The LDA fit dominates this endpoint, and identical filters over an
+        # unchanged corpus produce identical output - serve those from cache,
+        # keyed on the filter set plus a corpus fingerprint (row count and
+        # newest update)
+        last_update = feedbacks.aggregate(m=Max('updated_at'))['m']
+        cache_key = 'topic_modeling:' + hashlib.md5(
+            f'{instructor_id}:{course_id}:{department}:{semester}:'
+            f'{academic_year}:{feedback_count}:{last_update}'.encode()
+        ).hexdigest()
+        cached_payload = cache.get(cache_key)
+        if cached_payload is not None:
+            return Response(cached_payload)
+
+        # Combine all text feedback fields - values_list tuples streamed in
+        # chunks instead of instantiating a Feedback object per row
+        feedback_texts = []
+        emotion_rows = []
+        text_rows = feedbacks.values_list(
+            'suggested_changes', 'best_teaching_aspect',
+            'least_teaching_aspect', 'further_comments',
+            'emotion_suggested_changes', 'emotion_best_aspect',
+            'emotion_least_aspect', 'emotion_further_comments'
+        )
+        for sc, bt, la, fc, e1, e2, e3, e4 in text_rows.iterator(chunk_size=2000):
+            combined_text = ' '.join(x for x in (sc, bt, la, fc) if x)
+
             if combined_text.strip():
-                # Get dominant emotion
-                emotions = []
-                if fb.emotion_suggested_changes:
-                    emotions.append(fb.emotion_suggested_changes)
-                if fb.emotion_best_aspect:
-                    emotions.append(fb.emotion_best_aspect)
-                if fb.emotion_least_aspect:
-                    emotions.append(fb.emotion_least_aspect)
-                if fb.emotion_further_comments:
-                    emotions.append(fb.emotion_further_comments)
-                
-                from collections import Counter
-                emotion = Counter(emotions).most_common(1)[0][0] if emotions else 'acceptance'
-                
-                feedback_data.append({
-                    'feedback': combined_text,
-                    'label': emotion
-                })
-        
-        if len(feedback_data) < 10:
+                feedback_texts.append(combined_text)
+                emotion_rows.append((e1, e2, e3, e4))
+
+        if len(feedback_texts) < 10:
             return Response({
-                'error': f'Need at least 10 text feedbacks for topic modeling. Currently have {len(feedback_data)}.',
+                'error': f'Need at least 10 text feedbacks for topic modeling. Currently have {len(feedback_texts)}.',
                 'topics': [],
                 'topic_distribution': {},
                 'total_topics': 0
             })
-        
-        all_feedback = pd.DataFrame(feedback_data)
-        
-        # Preprocess text
-        def preprocess_for_topics(text):
-            text = str(text).lower()
-            # Faculty names to filter out (all variations)
-            faculty_names = {
-                'salimar', 'salih', 'sal', 'sir', 'maam', "ma'am", 'mr', 'mrs', 'ms',
-                'jaydee', 'ballaho', 'lucy', 'felix', 'sadiwa', 'odon', 'maravilla',
-                'arip', 'chris', 'sherard', 'lines', 'marjory', 'rojas', 'marj',
-                'rhamirl', 'jaafar', 'rham', 'ram', 'jlo', 'edios', 'jaylo',
-                'mark', 'flores', 'yara', 'professor', 'prof', 'teacher', 'instructor'
-            }
-            words = [w for w in text.split() 
-                     if len(w) > 3 and not w.isdigit() and w not in faculty_names]
-            return ' '.join(words)
-        
-        all_feedback['cleaned_text'] = all_feedback['feedback'].apply(preprocess_for_topics)
-        
-        # Create document-term matrix
+
+        all_feedback = pd.DataFrame({'feedback': feedback_texts})
+        # Dominant emotion per row as one vectorized mode over the four
+        # per-field emotion columns instead of a Counter per feedback;
+        # rows with no emotion at all default to acceptance
+        emotions_df = pd.DataFrame(emotion_rows, columns=['e1', 'e2', 'e3', 'e4'])
+        all_feedback['label'] = emotions_df.mode(axis=1)[0].fillna('acceptance')
+        
+        # Create document-term matrix straight from the raw text. The
+        # token_pattern does what the old preprocess pass did - alphabetic
+        # tokens of 4+ chars, which also drops digits and short words - so
+        # the corpus is tokenized once instead of twice, and the faculty
+        # names ride along in the stop-word list
         vectorizer = CountVectorizer(
             max_features=1000,
             max_df=0.8,
             min_df=2,
-            stop_words='english'
+            token_pattern=r'(?u)\b[a-z]{4,}\b',
+            stop_words=list(ENGLISH_STOP_WORDS.union(_FACULTY_NAME_STOPWORDS)),
+            dtype=np.int32  # counts never approach int64 range at this scale
         )
-        
-        doc_term_matrix = vectorizer.fit_transform(all_feedback['cleaned_text'])
+
+        doc_term_matrix = vectorizer.fit_transform(all_feedback['feedback'])
         feature_names = vectorizer.get_feature_names_out()
         
         # Train LDA model - dynamically adjust topics based on data size
@@ -1131,40 +1185,40 @@ def get_topic_modeling_data(request):
         
         lda_model = LatentDirichletAllocation(
             n_components=n_topics,
-            max_iter=50,
             learning_method='online',
+            learning_offset=10.0,
+            learning_decay=0.7,
             random_state=42,
-            n_jobs=-1
+            n_jobs=-1,
+            # partial_fit scales each mini-batch's statistics by
+            # total_samples / batch; left at the 1e6 default that ratio
+            # would drown the prior for a corpus this size
+            total_samples=doc_term_matrix.shape[0]
         )
-        
-        lda_output = lda_model.fit_transform(doc_term_matrix)
-        
-        # Generate topic names and keywords
+
+        # Online variational updates over 256-doc mini-batches: two passes
+        # converge at this corpus size, instead of 50 full-corpus iterations
+        # with fit_transform
+        for _ in range(2):
+            for start in range(0, doc_term_matrix.shape[0], 256):
+                lda_model.partial_fit(doc_term_matrix[start:start + 256])
+
+        # Halve the memory traffic of the transform's sparse-dense products;
+        # float32 is plenty for topic-word weights
+        lda_model.components_ = lda_model.components_.astype(np.float32)
+        lda_model.exp_dirichlet_component_ = lda_model.exp_dirichlet_component_.astype(np.float32)
+        lda_output = lda_model.transform(doc_term_matrix)
+
+        # Generate topic names and keywords - exact lookups against the
+        # module-level keyword->category map
         def generate_topic_name(keywords):
-            keyword_list = [k.lower() for k in keywords[:10]]
-            
-            topic_patterns = {
-                'Teaching Quality': ['teaching', 'instructor', 'professor', 'explain', 'explains', 'clear', 'understanding', 'lectures', 'lecture'],
-                'Course Content': ['content', 'material', 'materials', 'topics', 'subject', 'curriculum', 'knowledge', 'learning'],
-                'Assignments & Workload': ['assignments', 'homework', 'workload', 'tasks', 'work', 'projects', 'assignment', 'deadline'],
-                'Class Engagement': ['class', 'interactive', 'activities', 'discussions', 'participate', 'engaging', 'interesting', 'attention'],
-                'Assessment & Grading': ['exam', 'exams', 'test', 'tests', 'grade', 'grading', 'feedback', 'assessment', 'evaluation'],
-                'Time Management': ['time', 'schedule', 'pace', 'pacing', 'deadlines', 'timing', 'duration', 'hours'],
-                'Learning Support': ['help', 'support', 'guidance', 'office', 'hours', 'questions', 'clarification', 'assistance'],
-                'Course Organization': ['organized', 'structure', 'syllabus', 'schedule', 'plan', 'organization'],
-                'Student Experience': ['experience', 'enjoy', 'enjoyed', 'appreciate', 'liked', 'love', 'positive', 'good'],
-                'Communication': ['communication', 'responds', 'response', 'email', 'available', 'accessible', 'communicates']
-            }
-            
-            category_scores = {}
-            for category, patterns in topic_patterns.items():
-                score = sum(1 for kw in keyword_list if any(pattern in kw for pattern in patterns))
-                if score > 0:
-                    category_scores[category] = score
-            
-            if category_scores:
-                return max(category_scores, key=category_scores.get)
-            
+            scores = Counter(
+                _TOPIC_CATEGORY_MAP[kw] for kw in map(str.lower, keywords[:10])
+                if kw in _TOPIC_CATEGORY_MAP
+            )
+            if scores:
+                return scores.most_common(1)[0][0]
+
             return ' & '.join([k.title() for k in keywords[:2]])
         
         # Extract topics with meaningful names
@@ -1173,7 +1227,12 @@ def get_topic_modeling_data(request):
         used_names = {}  # Track used names to ensure uniqueness
         
         for topic_idx, topic in enumerate(lda_model.components_):
-            top_indices = topic.argsort()[-15:][::-1]
+            # argpartition selects the top k in O(V), then only those get
+            # sorted; clamp k because tiny filtered corpora can end up with
+            # fewer than 15 vocabulary terms
+            k = min(15, topic.size)
+            part = np.argpartition(topic, -k)[-k:]
+            top_indices = part[np.argsort(topic[part])[::-1]]
             top_words = [feature_names[i] for i in top_indices]
             base_name = generate_topic_name(top_words)
             
@@ -1193,9 +1252,11 @@ def get_topic_modeling_data(request):
                 'keywords': top_words[:10]
             })
         
-        # Assign dominant topic to each feedback
-        all_feedback['dominant_topic'] = lda_output.argmax(axis=1)
-        all_feedback['topic_probability'] = lda_output.max(axis=1)
+        # Assign dominant topic to each feedback - the probability is a
+        # gather at the argmax indices instead of a second full max() scan
+        dominant = lda_output.argmax(axis=1)
+        all_feedback['dominant_topic'] = dominant
+        all_feedback['topic_probability'] = lda_output[np.arange(len(dominant)), dominant]
         
         # Calculate topic distribution
         topic_counts = all_feedback['dominant_topic'].value_counts().to_dict()
@@ -1204,7 +1265,8 @@ def get_topic_modeling_data(request):
         # Calculate topic-emotion distribution
         topic_emotion_dist = {}
         if 'label' in all_feedback.columns:
-            topic_emotion = all_feedback.groupby(['dominant_topic', 'label']).size().unstack(fill_value=0)
+            # crosstab pivots in one pass instead of groupby + unstack
+            topic_emotion = pd.crosstab(all_feedback['dominant_topic'], all_feedback['label'])
             topic_emotion_dist = topic_emotion.to_dict('index')
             topic_emotion_dist = {topic_name_map.get(k, f'Topic {k+1}'): v for k, v in topic_emotion_dist.items()}
         
@@ -1222,7 +1284,7 @@ def get_topic_modeling_data(request):
                 'insights': insights
             })
         
-        return Response({
+        payload = {
             'topics': topics_data,
             'topic_distribution': topic_distribution,
             'topic_emotion_distribution': topic_emotion_dist,
@@ -1230,7 +1292,9 @@ def get_topic_modeling_data(request):
             'total_topics': len(topics_data),
             'insights_method': 'dynamic-lda',
             'filtered': bool(instructor_id or course_id or department or semester or academic_year)
-        })
+        }
+        cache.set(cache_key, payload, timeout=3600)
+        return Response(payload)
         
     except Exception as e:
         logger.error(f"Error generating topic modeling data: {str(e)}")
@@ -1403,28 +1467,10 @@ def export_feedback_pdf(request):
     # Base queryset
     feedback_qs = Feedback.objects.filter(status='submitted')
     
-    # Apply department filter for dean (overrides RBAC)
-    if department and user.role == 'admin' and user.admin_subrole == 'dean':
-        if department == 'CS':
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif department == 'IT':
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif department == 'ACT':
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
-    # RBAC: Department head restrictions (only if no department filter)
-    elif user.role == 'admin' and user.admin_subrole:
-        if user.admin_subrole == 'dept_head_cs':
-            feedback_qs = feedback_qs.filter(course_assignment__department='CS')
-        elif user.admin_subrole == 'dept_head_it':
-            feedback_qs = feedback_qs.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif user.admin_subrole == 'dept_head_act':
-            feedback_qs = feedback_qs.filter(course_assignment__department='ACT')
+    # RBAC / dean department override (see _rbac_department_filter)
+    dept_q = _rbac_department_filter(user.role, user.admin_subrole, department)
+    if dept_q is not None:
+        feedback_qs = feedback_qs.filter(dept_q)
     
     # Apply filters
     if semester and semester != 'all':
@@ -1484,17 +1530,34 @@ def export_feedback_pdf(request):
     
     # Generate PDF
     try:
+        # Pre-fetch related rows and restrict to the columns the report reads
+        # so the generator doesn't issue a query per feedback row
+        feedback_qs = feedback_qs.select_related(
+            'course_assignment__course',
+            'course_assignment__instructor',
+            'student',
+        ).only(
+            'id', 'submitted_at', 'created_at',
+            'suggested_changes', 'best_teaching_aspect',
+            'course_assignment__section',
+            'course_assignment__course__code',
+            'course_assignment__course__name',
+            'course_assignment__instructor__first_name',
+            'course_assignment__instructor__last_name',
+            'student__first_name', 'student__last_name',
+        )
         pdf_buffer = generate_feedback_report_pdf(feedback_qs, filters, user)
         
         response = HttpResponse(pdf_buffer, content_type='application/pdf')
         
-        # Generate filename with professor name if filtered
+        # Generate filename with professor name if filtered (single aware timestamp)
+        now = timezone.now()
         if filters.get('instructor_name'):
             # Replace spaces with underscores and remove special characters
             prof_name = filters['instructor_name'].replace(' ', '_').replace(',', '')
-            filename = f"feedback-report-{prof_name}-{datetime.now().strftime('%Y%m%d')}.pdf"
+            filename = f"feedback-report-{prof_name}-{now.strftime('%Y%m%d')}.pdf"
         else:
-            filename = f"feedback-report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.pdf"
+            filename = f"feedback-report-{now.strftime('%Y%m%d-%H%M%S')}.pdf"
         
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
@@ -1510,6 +1573,7 @@ def export_feedback_pdf(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=_courses_list_etag)
 def get_courses_list(request):
     """Get list of courses filtered by department and/or instructor (for cascading dropdowns)"""
     user = request.user
@@ -1553,19 +1617,11 @@ def get_courses_list(request):
             assignments__is_active=True
         ).distinct()
     
-    # Order by department, year level, and code
-    courses_qs = courses_qs.order_by('department', 'year_level', 'code')
-    
-    # Serialize courses
-    courses_data = []
-    for course in courses_qs:
-        courses_data.append({
-            'id': course.id,
-            'code': course.code,
-            'name': course.name,
-            'department': course.department,
-            'year_level': course.year_level,
-        })
+    # Serialize straight from the DB cursor - no Course instances needed
+    courses_data = list(
+        courses_qs.order_by('department', 'year_level', 'code')
+        .values('id', 'code', 'name', 'department', 'year_level')
+    )
     
     return Response({
         'success': True,
@@ -1579,8 +1635,7 @@ def get_response_stats(request):
     """
     Get feedback response statistics including respondents and non-respondents
     """
-    from django.db.models import Count, Q
-    from collections import defaultdict
+    from django.db.models import Count, Exists, OuterRef, Q, Subquery
     
     user = request.user
     semester = request.GET.get('semester')
@@ -1615,71 +1670,86 @@ def get_response_stats(request):
         elif user.admin_subrole == 'dept_head_it':
             enrollments_qs = enrollments_qs.filter(course_assignment__department__in=['IT', 'ACT'])
     
-    # Get total unique students (not enrollments)
-    total_students = enrollments_qs.values('student_id').distinct().count()
-    
-    # Get all feedbacks for these enrollments in ONE query
-    enrollment_list = list(enrollments_qs.values_list('student_id', 'course_assignment_id'))
-    
-    # Build Q objects for all enrollment pairs
-    from django.db import models as django_models
-    feedback_queries = [
-        django_models.Q(student_id=student_id, course_assignment_id=assignment_id)
-        for student_id, assignment_id in enrollment_list
-    ]
-    
-    # Get all submitted feedbacks at once
-    feedbacks = {}
-    if feedback_queries:
-        # Combine Q objects with OR
-        combined_q = feedback_queries[0]
-        for q in feedback_queries[1:]:
-            combined_q |= q
-        
-        feedback_qs = Feedback.objects.filter(
-            combined_q,
-            status='submitted'
-        ).select_related('student', 'course_assignment__course')
-        
-        # Create lookup dict: (student_id, assignment_id) -> feedback
-        for feedback in feedback_qs:
-            key = (feedback.student_id, feedback.course_assignment_id)
-            feedbacks[key] = feedback
-    
-    # Now iterate enrollments once to build respondents and non-respondents
-    # Also track per-student progress
+    # Annotate each enrollment with its submitted feedback via subqueries
+    # instead of prefetching feedback through a giant OR-of-Q lookup
+    feedback_match = Feedback.objects.filter(
+        status='submitted',
+        student_id=OuterRef('student_id'),
+        course_assignment_id=OuterRef('course_assignment_id'),
+    )
+    enrollment_rows = enrollments_qs.annotate(
+        has_feedback=Exists(feedback_match),
+        feedback_submitted_at=Subquery(feedback_match.values('submitted_at')[:1]),
+        feedback_created_at=Subquery(feedback_match.values('created_at')[:1]),
+    ).values(
+        'student_id',
+        'student__first_name',
+        'student__last_name',
+        'student__email',
+        'student__student_id',
+        'course_assignment__section',
+        'course_assignment__course__code',
+        'course_assignment__course__name',
+        'has_feedback',
+        'feedback_submitted_at',
+        'feedback_created_at',
+    )
+    enrollment_rows = list(enrollment_rows)
+
+    # Common dashboard case while users type filters: nothing matches.
+    # Skip the progress build and the submissions query entirely.
+    if not enrollment_rows:
+        return Response({
+            'total_students': 0,
+            'total_enrollments': 0,
+            'total_completed': 0,
+            'response_rate': 0,
+            'respondents': [],
+            'non_respondents': [],
+            'submissions_over_time': []
+        }, status=status.HTTP_200_OK)
+
+    # Single pass over the annotated rows to build per-student progress
+    # (overall totals are kept as running counters in the same pass)
     student_progress = {}  # student_id -> {completed: int, total: int, feedbacks: []}
-    
-    for enrollment in enrollments_qs:
-        student_id = enrollment.student.id
-        
+    total_enrollments = 0
+    total_completed = 0
+
+    for row in enrollment_rows:
+        student_id = row['student_id']
+
         # Initialize student progress tracking
         if student_id not in student_progress:
             student_progress[student_id] = {
                 'id': student_id,
-                'name': f"{enrollment.student.first_name} {enrollment.student.last_name}",
-                'email': enrollment.student.email,
-                'student_id': enrollment.student.student_id,
+                'name': f"{row['student__first_name']} {row['student__last_name']}",
+                'email': row['student__email'],
+                'student_id': row['student__student_id'],
                 'completed': 0,
                 'total': 0,
                 'feedbacks': []
             }
-        
-        key = (enrollment.student.id, enrollment.course_assignment.id)
-        feedback = feedbacks.get(key)
-        
+
+        submitted = row['has_feedback']
+        submitted_at = (row['feedback_submitted_at'] or row['feedback_created_at']) if submitted else None
+
         feedback_data = {
-            'course': f"{enrollment.course_assignment.course.code} - {enrollment.course_assignment.course.name}",
-            'section': enrollment.course_assignment.section,
-            'submitted': feedback is not None,
-            'submitted_at': feedback.submitted_at.isoformat() if feedback and feedback.submitted_at else (feedback.created_at.isoformat() if feedback else None)
+            'course': f"{row['course_assignment__course__code']} - {row['course_assignment__course__name']}",
+            'section': row['course_assignment__section'],
+            'submitted': submitted,
+            'submitted_at': submitted_at.isoformat() if submitted_at else None
         }
-        
+
         student_progress[student_id]['total'] += 1
-        if feedback:
+        total_enrollments += 1
+        if submitted:
             student_progress[student_id]['completed'] += 1
+            total_completed += 1
         student_progress[student_id]['feedbacks'].append(feedback_data)
     
+    # Unique students already grouped by the progress map - no extra COUNT query
+    total_students = len(student_progress)
+
     # Build respondents and non_respondents with progress
     respondents = []
     non_respondents = []
@@ -1695,25 +1765,27 @@ def get_response_stats(request):
             non_respondents.append(progress)
     
     # Calculate response rate based on total feedback submissions vs total enrollments
-    total_enrollments = sum(p['total'] for p in student_progress.values())
-    total_completed = sum(p['completed'] for p in student_progress.values())
     response_rate = (total_completed / total_enrollments * 100) if total_enrollments > 0 else 0
     
     # Get submissions over time (last 30 days)
-    from datetime import datetime, timedelta
+    from datetime import timedelta
     from django.db.models.functions import TruncDate
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    # Get student and course_assignment IDs from enrollments
-    student_ids = enrollments_qs.values_list('student_id', flat=True)
-    assignment_ids = enrollments_qs.values_list('course_assignment_id', flat=True)
+    # timezone.now() keeps the cutoff aware so it compares cleanly with
+    # the timezone-aware created_at column
+    thirty_days_ago = timezone.now() - timedelta(days=30)
     
-    # Filter feedback by students and course assignments in scope
+    # Materialize the in-scope IDs so the feedback query gets a plain
+    # IN (...) list instead of a correlated subquery per ID set
+    student_ids = list(enrollments_qs.values_list('student_id', flat=True).distinct())
+    assignment_ids = list(enrollments_qs.values_list('course_assignment_id', flat=True).distinct())
+
+    # Filter feedback by students and course assignments in scope;
+    # TruncDate maps to the DB-native date() so the grouping stays in SQL
     submissions_by_date = Feedback.objects.filter(
         status='submitted',
         created_at__gte=thirty_days_ago,
-        student__in=student_ids,
-        course_assignment__in=assignment_ids
+        student_id__in=student_ids,
+        course_assignment_id__in=assignment_ids
     ).annotate(
         date=TruncDate('created_at')
     ).values('date').annotate(count=Count('id')).order_by('date')
@@ -1739,46 +1811,15 @@ def get_response_stats(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])  # Allow unauthenticated access for word cloud
+@condition(etag_func=_sentiment_words_etag)
 def get_sentiment_words(request):
     """
-    Load positive and negative word lists from text files
+    Serve the positive and negative word lists (loaded and serialized once)
     """
-    from pathlib import Path
-    
     try:
-        base_path = Path(__file__).parent.parent / 'data' / 'annotations'
-        
-        logger.info(f"Loading sentiment words from: {base_path}")
-        
-        # Load positive words
-        positive_file = base_path / 'positive-words.txt'
-        positive_words = []
-        if positive_file.exists():
-            with open(positive_file, 'r', encoding='utf-8', errors='ignore') as f:
-                positive_words = [line.strip() for line in f if line.strip() and not line.startswith(';')]
-            logger.info(f"Loaded {len(positive_words)} positive words")
-        else:
-            logger.error(f"Positive words file not found: {positive_file}")
-        
-        # Load negative words
-        negative_file = base_path / 'negative-words.txt'
-        negative_words = []
-        if negative_file.exists():
-            with open(negative_file, 'r', encoding='utf-8', errors='ignore') as f:
-                negative_words = [line.strip() for line in f if line.strip() and not line.startswith(';')]
-            logger.info(f"Loaded {len(negative_words)} negative words")
-        else:
-            logger.error(f"Negative words file not found: {negative_file}")
-        
-        return Response({
-            'positive': positive_words,
-            'negative': negative_words,
-            'count': {
-                'positive': len(positive_words),
-                'negative': len(negative_words)
-            }
-        }, status=status.HTTP_200_OK)
-        
+        # Cached JSON bytes - skips DRF rendering for this static payload
+        return HttpResponse(_sentiment_words_payload(), content_type='application/json')
+
     except Exception as e:
         logger.error(f"Error loading sentiment words: {str(e)}")
         import traceback
@@ -2819,28 +2860,10 @@ def apply_rbac_filters(queryset, user, request):
     course_id = request.GET.get('course_id')
     department = request.GET.get('department')
     
-    # Apply department filter for dean (overrides RBAC)
-    if department and user.role == 'admin' and user.admin_subrole == 'dean':
-        if department == 'CS':
-            queryset = queryset.filter(course_assignment__department='CS')
-        elif department == 'IT':
-            queryset = queryset.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif department == 'ACT':
-            queryset = queryset.filter(course_assignment__department='ACT')
-    # RBAC: Department head restrictions
-    elif user.role == 'admin' and user.admin_subrole:
-        if user.admin_subrole == 'dept_head_cs':
-            queryset = queryset.filter(course_assignment__department='CS')
-        elif user.admin_subrole == 'dept_head_it':
-            queryset = queryset.filter(
-                Q(course_assignment__department='IT') |
-                Q(course_assignment__department='ICT')
-            )
-        elif user.admin_subrole == 'dept_head_act':
-            queryset = queryset.filter(course_assignment__department='ACT')
+    # RBAC / dean department override (see _rbac_department_filter)
+    dept_q = _rbac_department_filter(user.role, user.admin_subrole, department)
+    if dept_q is not None:
+        queryset = queryset.filter(dept_q)
     
     # Apply filters
     if semester and semester != 'all':
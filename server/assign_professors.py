@@ -1,6 +1,7 @@
 """
 Assign professors to courses/subjects with sections
 """
+import itertools
 import os
 import django
 
@@ -10,6 +11,7 @@ django.setup()
 from authentication.models import User
 from api.models import Course, CourseAssignment
 from django.db import transaction
+from django.db.models import Case, F, Value, When
 
 # Faculty mapping
 FACULTY_DATA = {
@@ -76,16 +78,25 @@ SECTIONS = {
 def update_faculty_names():
     """Update faculty names to Professor CS1, etc."""
     print("Updating faculty names...")
-    for dept, faculty_list in FACULTY_DATA.items():
-        for fac_data in faculty_list:
-            try:
-                user = User.objects.get(email=fac_data['email'])
-                user.first_name = fac_data['first']
-                user.last_name = fac_data['last']
-                user.save()
-                print(f"✅ Updated: {fac_data['email']} → {fac_data['first']} {fac_data['last']}")
-            except User.DoesNotExist:
-                print(f"⚠️  User not found: {fac_data['email']}")
+    all_faculty = [f for faculty_list in FACULTY_DATA.values() for f in faculty_list]
+    emails = [f['email'] for f in all_faculty]
+
+    # Single UPDATE with per-email CASE expressions instead of one save() per user
+    updated = User.objects.filter(email__in=emails).update(
+        first_name=Case(
+            *[When(email=f['email'], then=Value(f['first'])) for f in all_faculty],
+            default=F('first_name')
+        ),
+        last_name=Case(
+            *[When(email=f['email'], then=Value(f['last'])) for f in all_faculty],
+            default=F('last_name')
+        ),
+    )
+    print(f"✅ Updated {updated} of {len(emails)} faculty names")
+    if updated < len(emails):
+        missing = set(emails) - set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+        for email in sorted(missing):
+            print(f"⚠️  User not found: {email}")
 
 def assign_professors_to_courses():
     """Assign professors to courses with different sections"""
@@ -95,66 +106,69 @@ def assign_professors_to_courses():
     
     current_year = "2024-2025"
     assignments_created = 0
-    
+
+    # Load all faculty once instead of one SELECT per (course, section)
+    all_emails = [f['email'] for faculty_list in FACULTY_DATA.values() for f in faculty_list]
+    faculty_by_email = {u.email: u for u in User.objects.filter(email__in=all_emails)}
+
+    # Round-robin iterators per department, resolved to User rows up front
+    faculty_cycles = {
+        dept: itertools.cycle([faculty_by_email[f['email']] for f in faculty_list
+                               if f['email'] in faculty_by_email])
+        for dept, faculty_list in FACULTY_DATA.items()
+        if any(f['email'] in faculty_by_email for f in faculty_list)
+    }
+
     with transaction.atomic():
         # Clear existing assignments
         deleted_count = CourseAssignment.objects.all().delete()[0]
         print(f"\nCleared {deleted_count} existing assignments")
         
-        # Get all courses
-        courses = Course.objects.filter(is_active=True).order_by('department', 'year_level', 'semester')
-        
-        faculty_index = {}  # Track which faculty to assign next per department
-        
+        # Get all courses (streamed - no indexed access needed)
+        courses = Course.objects.filter(is_active=True).order_by('department', 'year_level', 'semester').iterator()
+
+        to_create = []  # Collect assignments for a single bulk INSERT
+
         for course in courses:
             dept = course.department
             year = course.year_level
             semester = course.semester
-            
+
             # Get sections for this department/year
             sections = SECTIONS.get(dept, {}).get(year, ['A'])
-            
-            # Get faculty for this department
-            dept_faculty = FACULTY_DATA.get(dept, [])
-            if not dept_faculty:
+
+            # Per-department round-robin iterator (replaces index + modulo)
+            faculty_cycle = faculty_cycles.get(dept)
+            if faculty_cycle is None:
                 print(f"⚠️  No faculty found for department {dept}")
                 continue
-            
-            # Initialize faculty index for this department
-            if dept not in faculty_index:
-                faculty_index[dept] = 0
-            
+
             print(f"\n📚 {course.code} - {course.name} ({dept} Y{year} {semester})")
-            
+
             # Assign different professors to different sections
             for section in sections:
-                # Get next faculty member (round-robin)
-                faculty_data = dept_faculty[faculty_index[dept] % len(dept_faculty)]
-                faculty_index[dept] += 1
-                
-                try:
-                    instructor = User.objects.get(email=faculty_data['email'])
-                    
-                    # Create assignment
-                    assignment = CourseAssignment.objects.create(
-                        course=course,
-                        instructor=instructor,
-                        year_level=year,
-                        section=section,
-                        department=dept,
-                        semester=semester,
-                        academic_year=current_year,
-                        schedule=f"MWF 9:00-10:00 AM",  # Default schedule
-                        is_active=True
-                    )
-                    
-                    assignments_created += 1
-                    print(f"  ✅ Section {section}: {instructor.get_full_name()} ({instructor.email})")
-                    
-                except User.DoesNotExist:
-                    print(f"  ❌ Section {section}: Faculty not found - {faculty_data['email']}")
-                except Exception as e:
-                    print(f"  ❌ Section {section}: Error - {str(e)}")
+                instructor = next(faculty_cycle)
+
+                to_create.append(CourseAssignment(
+                    course=course,
+                    instructor=instructor,
+                    year_level=year,
+                    section=section,
+                    department=dept,
+                    semester=semester,
+                    academic_year=current_year,
+                    schedule=f"MWF 9:00-10:00 AM",  # Default schedule
+                    is_active=True
+                ))
+                print(f"  ✅ Section {section}: {instructor.get_full_name()} ({instructor.email})")
+
+        # One multi-row INSERT instead of one INSERT per section
+        created = CourseAssignment.objects.bulk_create(to_create, batch_size=500)
+        assignments_created = len(created)
+
+        # bulk_create bypasses CourseAssignment.save(), so auto-enroll explicitly
+        for assignment in created:
+            assignment.auto_enroll_students()
     
     print("\n" + "="*80)
     print(f"✅ COMPLETED: {assignments_created} course assignments created!")
@@ -2,11 +2,34 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from .models import User
 
+
+class YearLevelFilter(admin.SimpleListFilter):
+    """Year-level filter backed by the fixed choices (no DISTINCT scan)."""
+    title = 'year level'
+    parameter_name = 'year_level'
+
+    def lookups(self, request, model_admin):
+        return User.YEAR_LEVEL_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(year_level=self.value())
+        return queryset
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ['email', 'username', 'role', 'admin_subrole', 'year_level', 'section', 'department', 'is_active', 'is_staff', 'created_at']
-    list_filter = ['role', 'admin_subrole', 'year_level', 'section', 'department', 'is_active', 'is_staff', 'created_at']
-    
+    # Wide-cardinality fields (section, department, created_at) stay off
+    # list_filter - their option lists require full-table DISTINCT scans
+    list_filter = ['role', 'admin_subrole', YearLevelFilter, 'is_active', 'is_staff']
+    # Also lets other admins point autocomplete_fields=['user'] here
+    search_fields = ['email', 'username', 'student_id', 'first_name', 'last_name', 'department']
+    ordering = ['-created_at']
+    list_select_related = True
+    list_per_page = 50
+    show_full_result_count = False
+
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal Info', {'fields': ('username', 'student_id', 'department')}),
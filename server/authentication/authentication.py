@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Cache key for per-user revocation; the value is the logout timestamp and
+# the TTL matches the access-token lifetime, after which any token issued
+# before logout has expired on its own
+REVOKED_USER_KEY = 'auth:revoked_before:{user_id}'
+
+
+class CachedBlacklistJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication with a cache-backed revocation fast path.
+
+    Logout stores the logout instant under the user's id; the check here
+    rejects any access token issued before that instant. This is an
+    in-memory comparison per request instead of a blacklist-table query -
+    the simplejwt DB blacklist is still written on logout as the durable
+    record for the refresh token. Keying on the user rather than a jti
+    matters because logout only sees the refresh token, whose jti never
+    appears on authenticated requests.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        user_id = token.get(api_settings.USER_ID_CLAIM)
+        iat = token.get('iat')
+        if user_id is not None and iat is not None:
+            revoked_at = cache.get(REVOKED_USER_KEY.format(user_id=user_id))
+            if revoked_at is not None and iat < revoked_at:
+                raise InvalidToken('Token has been revoked')
+        return token
@@ -1,4 +1,6 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
 from authentication.models import User
 from api.models import Enrollment, CourseAssignment, FeedbackSession, Feedback
 
@@ -6,6 +8,38 @@ from api.models import Enrollment, CourseAssignment, FeedbackSession, Feedback
 class Command(BaseCommand):
     help = 'Removes old test data (named email students and old faculty)'
 
+    def _delete_users_raw(self, emails):
+        """
+        Delete users plus their bulky domain child rows with _raw_delete,
+        skipping Django's collector and pre/post_delete signals for those
+        tables. The User rows themselves go through the ordinary collector
+        delete: users who have logged in own simplejwt OutstandingToken
+        rows (SET_NULL is enforced in Python, not the database), plus the
+        auth group/permission through tables and admin LogEntry - raw
+        deleting the users would trip those FK constraints.
+        """
+        user_ids = list(User.objects.filter(email__in=emails).values_list('id', flat=True))
+        if not user_ids:
+            return 0
+
+        with transaction.atomic():
+            # Student-side children
+            Feedback.objects.filter(student_id__in=user_ids)._raw_delete(Feedback.objects.db)
+            Enrollment.objects.filter(student_id__in=user_ids)._raw_delete(Enrollment.objects.db)
+
+            # Faculty-side children (feedback/enrollments hang off assignments)
+            assignment_ids = list(
+                CourseAssignment.objects.filter(instructor_id__in=user_ids).values_list('id', flat=True)
+            )
+            if assignment_ids:
+                Feedback.objects.filter(course_assignment_id__in=assignment_ids)._raw_delete(Feedback.objects.db)
+                Enrollment.objects.filter(course_assignment_id__in=assignment_ids)._raw_delete(Enrollment.objects.db)
+                CourseAssignment.objects.filter(id__in=assignment_ids)._raw_delete(CourseAssignment.objects.db)
+
+            User.objects.filter(id__in=user_ids).delete()
+
+        return len(user_ids)
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.WARNING('🧹 Cleaning up old test data...\n'))
         
@@ -28,34 +62,34 @@ class Command(BaseCommand):
             'prof.pedro.cruz@wmsu.edu.ph',
         ]
         
-        # Remove old test students
-        students_deleted = 0
+        # Remove old test students (raw batch delete, no collector/signals)
+        existing_students = set(
+            User.objects.filter(email__in=old_test_students).values_list('email', flat=True)
+        )
+        students_deleted = self._delete_users_raw(old_test_students)
         for email in old_test_students:
-            try:
-                user = User.objects.get(email=email)
-                user.delete()
-                students_deleted += 1
+            if email in existing_students:
                 self.stdout.write(f'  ✓ Removed student: {email}')
-            except User.DoesNotExist:
-                pass
-        
-        # Remove old test faculty
-        faculty_deleted = 0
+
+        # Remove old test faculty (raw batch delete, no collector/signals)
+        existing_faculty = set(
+            User.objects.filter(email__in=old_test_faculty).values_list('email', flat=True)
+        )
+        faculty_deleted = self._delete_users_raw(old_test_faculty)
         for email in old_test_faculty:
-            try:
-                user = User.objects.get(email=email)
-                user.delete()
-                faculty_deleted += 1
+            if email in existing_faculty:
                 self.stdout.write(f'  ✓ Removed faculty: {email}')
-            except User.DoesNotExist:
-                pass
-        
+
         self.stdout.write(self.style.SUCCESS(f'\n✅ Cleanup complete!'))
         self.stdout.write(f'  • Removed {students_deleted} old test students')
         self.stdout.write(f'  • Removed {faculty_deleted} old test faculty')
-        
-        # Show current counts
+
+        # Show current counts (one grouped aggregate for the user totals)
+        role_counts = User.objects.aggregate(
+            students=Count('id', filter=Q(role='student')),
+            faculty=Count('id', filter=Q(role='faculty')),
+        )
         self.stdout.write('\n📊 Current Database:')
-        self.stdout.write(f'  • Total Students: {User.objects.filter(role="student").count()}')
-        self.stdout.write(f'  • Total Faculty: {User.objects.filter(role="faculty").count()}')
+        self.stdout.write(f'  • Total Students: {role_counts["students"]}')
+        self.stdout.write(f'  • Total Faculty: {role_counts["faculty"]}')
         self.stdout.write(f'  • Total Enrollments: {Enrollment.objects.count()}')
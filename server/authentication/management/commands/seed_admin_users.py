@@ -1,11 +1,12 @@
 from django.core.management.base import BaseCommand
 from authentication.models import User
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 
 class Command(BaseCommand):
     help = 'Seeds the database with admin users: CS Dept Head, IT Dept Head, and Dean'
 
+    @transaction.atomic
     def handle(self, *args, **options):
         admin_users = [
             {
@@ -37,24 +38,30 @@ class Command(BaseCommand):
         created_count = 0
         skipped_count = 0
 
+        # One lookup for all planned emails instead of exists() per user
+        planned = [u['email'] for u in admin_users]
+        existing = set(User.objects.filter(email__in=planned).values_list('email', flat=True))
+
         for user_data in admin_users:
             password = user_data.pop('password')
             email = user_data['email']
-            
+
             try:
                 # Check if user already exists
-                if User.objects.filter(email=email).exists():
+                if email in existing:
                     self.stdout.write(
                         self.style.WARNING(f'User {email} already exists - skipping')
                     )
                     skipped_count += 1
                     continue
                 
-                # Create the user
-                user = User.objects.create(**user_data)
-                user.set_password(password)
-                user.is_staff = True  # Allow access to Django admin
-                user.save()
+                # Create the user (savepoint so a conflict doesn't poison
+                # the outer transaction)
+                with transaction.atomic():
+                    user = User.objects.create(**user_data)
+                    user.set_password(password)
+                    user.is_staff = True  # Allow access to Django admin
+                    user.save()
                 
                 self.stdout.write(
                     self.style.SUCCESS(f'✓ Created {user.get_admin_subrole_display()}: {email}')
@@ -1,4 +1,9 @@
+from collections import defaultdict
+
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 from datetime import timedelta
 from authentication.models import User
@@ -8,6 +13,8 @@ from api.models import Course, CourseAssignment, FeedbackSession, Enrollment
 class Command(BaseCommand):
     help = 'Seeds IT and ICT students (both under IT department)'
 
+    # One transaction = one commit/fsync for the whole seed
+    @transaction.atomic
     def handle(self, *args, **options):
         self.stdout.write(self.style.WARNING('Starting IT and ICT student seeding...\n'))
         
@@ -21,9 +28,12 @@ class Command(BaseCommand):
         # CREATE IT AND ICT STUDENTS
         # ============================================
         self.stdout.write(self.style.SUCCESS('👨‍🎓 Creating IT and ICT Students...\n'))
-        students_created = 0
-        student_counter = {}
-        
+        student_counter = defaultdict(lambda: defaultdict(int))
+
+        # Hash the shared seed password once - the hasher is the expensive part
+        hashed_password = make_password('Student@123')
+        planned_users = []
+
         for dept in departments:
             self.stdout.write(self.style.WARNING(f'{dept} Department:'))
             
@@ -31,27 +41,19 @@ class Command(BaseCommand):
             # CS uses 00001-00030 per year level
             # IT uses 10001-10030 per year level
             # ICT uses 20001-20030 per year level
-            base_offset = 0
-            if dept == 'IT':
-                base_offset = 10000
-            elif dept == 'ICT':
-                base_offset = 20000
-            
+            base_offset = {'IT': 10000, 'ICT': 20000}.get(dept, 0)
+            first_name = f'{dept} Student'
+
             for year_level in year_levels:
+                # Generate student ID: Year code based on year level
+                year_code = 2025 - year_level
+
                 for section in sections_per_year:
                     for student_num in range(1, students_per_section + 1):
-                        # Generate student ID: Year code based on year level
-                        year_code = 2025 - year_level
-                        
-                        # Generate unique counter for each department and year
-                        if dept not in student_counter:
-                            student_counter[dept] = {}
-                        if year_level not in student_counter[dept]:
-                            student_counter[dept][year_level] = 1
-                        
-                        counter = student_counter[dept][year_level]
+                        # Unique counter for each department and year
                         student_counter[dept][year_level] += 1
-                        
+                        counter = student_counter[dept][year_level]
+
                         # Format: YYYYXXXXX with department offset
                         # CS: 202200001-202200030
                         # IT: 202210001-202210030
@@ -60,26 +62,28 @@ class Command(BaseCommand):
                         email = f'{student_id_num}@wmsu.edu.ph'
                         username = f'student_{dept.lower()}_{student_id_num}'
                         
-                        user, created = User.objects.get_or_create(
+                        planned_users.append(User(
                             email=email,
-                            defaults={
-                                'username': username,
-                                'student_id': student_id_num,
-                                'first_name': f'{dept} Student',
-                                'last_name': f'{student_id_num}',
-                                'role': 'student',
-                                'department': dept,
-                                'year_level': year_level,
-                                'section': f'{year_level}{section}'
-                            }
-                        )
-                        if created:
-                            user.set_password('Student@123')
-                            user.save()
-                            students_created += 1
-                            if students_created % 10 == 0:
-                                self.stdout.write(f'  ... {students_created} students created')
-        
+                            username=username,
+                            password=hashed_password,
+                            student_id=student_id_num,
+                            first_name=first_name,
+                            last_name=f'{student_id_num}',
+                            role='student',
+                            department=dept,
+                            year_level=year_level,
+                            section=f'{year_level}{section}'
+                        ))
+
+        # Skip users that already exist, then insert the rest in one batch
+        existing = set(
+            User.objects.filter(email__in=[u.email for u in planned_users])
+            .values_list('email', flat=True)
+        )
+        new_users = [u for u in planned_users if u.email not in existing]
+        User.objects.bulk_create(new_users, batch_size=500, ignore_conflicts=True)
+        students_created = len(new_users)
+
         self.stdout.write(self.style.SUCCESS(f'\n✓ Created {students_created} new students\n'))
         
         # ============================================
@@ -88,29 +92,37 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('🎓 Triggering auto-enrollment for existing course assignments...\n'))
         
         # Re-trigger auto-enrollment for all existing IT and ICT course assignments
-        it_ict_assignments = CourseAssignment.objects.filter(department__in=['IT', 'ICT'])
-        enrollments_created = 0
-        
+        it_ict_assignments = list(CourseAssignment.objects.filter(department__in=['IT', 'ICT']))
+
+        # One query for all IT/ICT students, grouped in memory, instead of
+        # one filtered SELECT per assignment
+        students_by_key = defaultdict(list)
+        student_rows = User.objects.filter(
+            role='student', department__in=['IT', 'ICT']
+        ).values_list('id', 'department', 'year_level', 'section')
+        for sid, s_dept, s_year, s_section in student_rows:
+            students_by_key[(s_dept, s_year)].append((sid, s_section))
+
+        pending = []
         for assignment in it_ict_assignments:
-            # Manually call auto_enroll_students for existing assignments
-            filters = {
-                'role': 'student',
-                'department': assignment.department,
-                'year_level': assignment.year_level
-            }
-            if assignment.section:
-                filters['section'] = assignment.section
-            
-            students = User.objects.filter(**filters)
-            for student in students:
-                enrollment, created = Enrollment.objects.get_or_create(
-                    student=student,
-                    course_assignment=assignment,
-                    defaults={'is_auto_enrolled': True}
-                )
-                if created:
-                    enrollments_created += 1
-        
+            for sid, s_section in students_by_key.get((assignment.department, assignment.year_level), []):
+                if assignment.section and s_section != assignment.section:
+                    continue
+                pending.append(Enrollment(
+                    student_id=sid,
+                    course_assignment_id=assignment.id,
+                    is_auto_enrolled=True
+                ))
+
+        # One batched INSERT; existing (student, assignment) pairs are skipped
+        existing_enrollments = Enrollment.objects.filter(
+            course_assignment__in=it_ict_assignments
+        ).count()
+        Enrollment.objects.bulk_create(pending, batch_size=1000, ignore_conflicts=True)
+        enrollments_created = Enrollment.objects.filter(
+            course_assignment__in=it_ict_assignments
+        ).count() - existing_enrollments
+
         self.stdout.write(self.style.SUCCESS(f'✓ Created {enrollments_created} new enrollments\n'))
         
         # ============================================
@@ -121,24 +133,29 @@ class Command(BaseCommand):
         self.stdout.write('='*70)
         
         self.stdout.write('\n📊 Database Summary:')
-        
-        # Student counts
-        total_students = User.objects.filter(role='student').count()
-        cs_students = User.objects.filter(role='student', department='CS').count()
-        it_students = User.objects.filter(role='student', department='IT').count()
-        ict_students = User.objects.filter(role='student', department='ICT').count()
-        
+
+        # One GROUP BY replaces a dozen per-group .count() scans
+        counts = {}
+        rows = User.objects.filter(role='student').values('department', 'year_level').annotate(n=Count('id'))
+        for row in rows:
+            counts[(row['department'], row['year_level'])] = row['n']
+
+        total_students = sum(counts.values())
+        dept_totals = {
+            dept: sum(n for (d, _), n in counts.items() if d == dept)
+            for dept in ['CS', 'IT', 'ICT']
+        }
+
         self.stdout.write(f'\n  • Total Students: {total_students}')
-        self.stdout.write(f'    - CS Students: {cs_students}')
-        self.stdout.write(f'    - IT Students: {it_students}')
-        self.stdout.write(f'    - ICT Students: {ict_students}')
-        
+        self.stdout.write(f'    - CS Students: {dept_totals["CS"]}')
+        self.stdout.write(f'    - IT Students: {dept_totals["IT"]}')
+        self.stdout.write(f'    - ICT Students: {dept_totals["ICT"]}')
+
         # Show breakdown by year level for IT and ICT
         for dept in ['IT', 'ICT']:
             self.stdout.write(f'\n  {dept} Department Breakdown:')
             for year in year_levels:
-                year_count = User.objects.filter(role='student', department=dept, year_level=year).count()
-                self.stdout.write(f'    · Year {year}: {year_count} students')
+                self.stdout.write(f'    · Year {year}: {counts.get((dept, year), 0)} students')
         
         self.stdout.write(f'\n  • Total Enrollments: {Enrollment.objects.count()}')
         self.stdout.write(f'  • Total Faculty: {User.objects.filter(role="faculty").count()}')
@@ -1,9 +1,12 @@
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from authentication.models import User
 
 class Command(BaseCommand):
     help = 'Seeds the database with initial users'
 
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         users_data = [
             {
@@ -38,11 +41,10 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(f'User {email} already exists'))
                 continue
             
-            password = user_data.pop('password')
-            user = User.objects.create(**user_data)
-            user.set_password(password)
-            user.save()
-            
+            # Hash up front so the row is inserted once, already credentialed
+            user_data['password'] = make_password(user_data.pop('password'))
+            User.objects.create(**user_data)
+
             self.stdout.write(self.style.SUCCESS(f'Successfully created user: {email}'))
 
         self.stdout.write(self.style.SUCCESS('User seeding completed!'))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.26 on 2025-12-08 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_user_section_user_year_level'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'department', 'year_level', 'section'], name='user_role_dept_yr_sec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role'], name='user_role_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.26 on 2025-12-08 10:29
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_user_role_dept_yr_sec_idx_user_user_role_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='users_email_lower_uidx'),
+        ),
+    ]
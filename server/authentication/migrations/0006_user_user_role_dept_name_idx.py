@@ -0,0 +1,17 @@
+# Generated by Django 4.2.26 on 2025-12-08 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_user_users_email_lower_uidx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'department', 'last_name', 'first_name'], name='user_role_dept_name_idx'),
+        ),
+    ]
@@ -1,11 +1,54 @@
-from django.contrib.auth.models import AbstractUser
+import re
+from functools import lru_cache
+
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
+
+# Matches seeded faculty email prefixes like facultyCS1 / facultyICT10
+_FACULTY_RE = re.compile(r'^faculty([A-Za-z]+)(\d+)$')
+
+
+@lru_cache(maxsize=4096)
+def _faculty_display(email_prefix):
+    """Map a facultyXX# email prefix to its display name, or None."""
+    match = _FACULTY_RE.match(email_prefix)
+    if match:
+        return f"{match.group(1)}professor-{match.group(2)}"
+    return None
+
+
+def display_name_for(email, role, first_name, last_name):
+    """Compute a display name from raw user columns (no instance needed)."""
+    if role == 'faculty':
+        display = _faculty_display(email.split('@', 1)[0])
+        if display:
+            return display
+        if first_name and last_name:
+            return f"{first_name} {last_name}"
+        return email.split('@')[0]
+
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return email
+
+
+class UserManager(BaseUserManager):
+    def with_related(self):
+        """Prefetch groups/permissions so per-user permission checks don't N+1."""
+        return self.prefetch_related('groups', 'user_permissions')
+
 
 class User(AbstractUser):
+    # Role codes - referenced by filters across the API and commands
+    ROLE_ADMIN = 'admin'
+    ROLE_FACULTY = 'faculty'
+    ROLE_STUDENT = 'student'
+
     ROLE_CHOICES = [
-        ('admin', 'Administrator'),
-        ('faculty', 'Faculty'),
-        ('student', 'Student'),
+        (ROLE_ADMIN, 'Administrator'),
+        (ROLE_FACULTY, 'Faculty'),
+        (ROLE_STUDENT, 'Student'),
     ]
 
     # Admin subroles: two department heads (CS and IT) and one dean
@@ -15,6 +58,11 @@ class User(AbstractUser):
         ('dean', 'Dean'),
     ]
     
+    # Plain dict lookups for __str__ - get_FOO_display() walks the choices
+    # tuple through _meta on every call, and admin renders str(user) per row
+    _ROLE_DISPLAY = dict(ROLE_CHOICES)
+    _SUBROLE_DISPLAY = dict(ADMIN_SUBROLE_CHOICES)
+
     YEAR_LEVEL_CHOICES = [
         (1, 'Year 1'),
         (2, 'Year 2'),
@@ -50,40 +98,34 @@ class User(AbstractUser):
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'role']
+
+    objects = UserManager()
     
     class Meta:
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Auto-enrollment and the seed/cleanup commands all filter on
+            # this exact column combination
+            models.Index(fields=['role', 'department', 'year_level', 'section'], name='user_role_dept_yr_sec_idx'),
+            models.Index(fields=['role'], name='user_role_idx'),
+            # Covers the admin user list: filter by role/department,
+            # ordered by name
+            models.Index(fields=['role', 'department', 'last_name', 'first_name'], name='user_role_dept_name_idx'),
+        ]
+        constraints = [
+            # Case-insensitive uniqueness: login lowercases emails, so
+            # 'Alice@x' and 'alice@x' must not both exist. Also indexes
+            # the email__iexact lookup used at login.
+            models.UniqueConstraint(Lower('email'), name='users_email_lower_uidx'),
+        ]
     
     def get_display_name(self):
         """Get a user-friendly display name for faculty"""
-        if self.role == 'faculty':
-            # Extract faculty identifier from email (e.g., facultyCS1 -> CSprofessor-1)
-            email_prefix = self.email.split('@')[0]  # Get facultyCS1 from facultyCS1@wmsu.edu.ph
-            
-            # Check if it matches the pattern facultyXX# where XX is dept and # is number
-            if email_prefix.startswith('faculty'):
-                dept_and_num = email_prefix.replace('faculty', '')  # CS1, IT2, ICT3
-                
-                # Extract department code (letters) and number (digits)
-                dept_code = ''.join([c for c in dept_and_num if c.isalpha()])  # CS, IT, ICT
-                prof_num = ''.join([c for c in dept_and_num if c.isdigit()])   # 1, 2, 3
-                
-                if dept_code and prof_num:
-                    return f"{dept_code}professor-{prof_num}"
-            
-            # Fallback: use first/last name or email
-            if self.first_name and self.last_name:
-                return f"{self.first_name} {self.last_name}"
-            return self.email.split('@')[0]
-        
-        # For non-faculty, use full name or email
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        return self.email
+        return display_name_for(self.email, self.role, self.first_name, self.last_name)
     
     def __str__(self):
         if self.role == 'admin' and self.admin_subrole:
-            return f"{self.email} ({self.get_admin_subrole_display()})"
-        return f"{self.email} ({self.get_role_display()})"
+            return f"{self.email} ({self._SUBROLE_DISPLAY.get(self.admin_subrole, self.admin_subrole)})"
+        return f"{self.email} ({self._ROLE_DISPLAY.get(self.role, self.role)})"
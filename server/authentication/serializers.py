@@ -3,6 +3,10 @@ from django.contrib.auth import authenticate
 from .models import User
 import re
 
+# Compiled once at import - these run on every login / password change
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PW_CLASSES_RE = re.compile(r'(?=.*[A-Z])(?=.*[a-z])(?=.*[0-9])')
+
 class UserSerializer(serializers.ModelSerializer):
     display_name = serializers.SerializerMethodField()
     
@@ -21,7 +25,7 @@ class LoginSerializer(serializers.Serializer):
     
     def validate_email(self, value):
         # Validate email format
-        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
+        if not _EMAIL_RE.match(value):
             raise serializers.ValidationError("Invalid email format")
         
         # Check if email ends with wmsu.edu.ph
@@ -40,24 +44,14 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if email and password:
-            # Check if user exists (case-insensitive lookup)
-            try:
-                user = User.objects.get(email__iexact=email)
-                # Update email to match the actual case in database
-                email = user.email
-            except User.DoesNotExist:
-                raise serializers.ValidationError("Invalid email or password")
-            
-            # Check if user is active
-            if not user.is_active:
-                raise serializers.ValidationError("This account has been deactivated")
-            
-            # Authenticate user - use email as the username field since USERNAME_FIELD = 'email'
+            # EmailBackend already looks the user up case-insensitively and
+            # rejects inactive accounts, so one authenticate() call is enough.
+            # The generic message also avoids revealing whether the email exists.
             user = authenticate(request=self.context.get('request'), email=email, password=password)
-            
+
             if not user:
                 raise serializers.ValidationError("Invalid email or password")
-            
+
             data['user'] = user
         else:
             raise serializers.ValidationError("Must include 'email' and 'password'")
@@ -72,12 +66,11 @@ class ChangePasswordSerializer(serializers.Serializer):
     def validate_new_password(self, value):
         if len(value) < 8:
             raise serializers.ValidationError("Password must be at least 8 characters long")
-        if not re.search(r'[A-Z]', value):
-            raise serializers.ValidationError("Password must contain at least one uppercase letter")
-        if not re.search(r'[a-z]', value):
-            raise serializers.ValidationError("Password must contain at least one lowercase letter")
-        if not re.search(r'[0-9]', value):
-            raise serializers.ValidationError("Password must contain at least one number")
+        # Single lookahead scan covers all three character classes
+        if not _PW_CLASSES_RE.match(value):
+            raise serializers.ValidationError(
+                "Password must contain at least one uppercase letter, one lowercase letter, and one number"
+            )
         return value
     
     def validate(self, data):
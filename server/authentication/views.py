@@ -3,22 +3,42 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from .models import User
+from django.core.cache import cache
+from django.db.models import Q
+from .models import User, display_name_for
 from .serializers import LoginSerializer, UserSerializer, ChangePasswordSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import REVOKED_USER_KEY
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+
+def _user_payload(user):
+    """Login-response user dict; same keys as UserSerializer, no DRF dispatch."""
+    return {
+        'id': user.id,
+        'email': user.email,
+        'username': user.username,
+        'role': user.role,
+        'admin_subrole': user.admin_subrole,
+        'student_id': user.student_id,
+        'department': user.department,
+        'is_active': user.is_active,
+        'created_at': user.created_at,
+        'display_name': user.get_display_name(),
+    }
+
 class LoginView(APIView):
     permission_classes = [permissions.AllowAny]
     
     def post(self, request):
         try:
-            # Debug logging
-            print(f"=== Login Request Debug ===")
-            print(f"Request data: {request.data}")
-            print(f"Content-Type: {request.content_type}")
-            
+            # Lazy debug logging - no body formatting unless DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Login request data=%s content_type=%s", request.data, request.content_type)
+
             serializer = LoginSerializer(data=request.data)
             
             if serializer.is_valid():
@@ -35,7 +55,7 @@ class LoginView(APIView):
                     'success': True,
                     'message': 'Login successful',
                     'data': {
-                        'user': UserSerializer(user).data,
+                        'user': _user_payload(user),
                         'tokens': {
                             'access': str(refresh.access_token),
                             'refresh': str(refresh)
@@ -45,10 +65,10 @@ class LoginView(APIView):
             
             # Handle validation errors
             error_message = 'Login failed'
-            
-            # Debug logging for errors
-            print(f"Serializer errors: {serializer.errors}")
-            
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Login serializer errors: %s", serializer.errors)
+
             # Check if there's a non_field_errors (general validation error)
             if 'non_field_errors' in serializer.errors:
                 error_message = serializer.errors['non_field_errors'][0]
@@ -81,6 +101,19 @@ class LogoutView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             token = RefreshToken(refresh_token)
+
+            # Record the logout instant under the user's id: the request
+            # authenticator rejects access tokens issued before it, which
+            # covers the access token paired with this refresh token. Only
+            # the refresh token reaches logout, so its jti would never
+            # match the jti on authenticated requests.
+            ttl = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+            cache.set(
+                REVOKED_USER_KEY.format(user_id=request.user.pk),
+                time.time(),
+                timeout=ttl
+            )
+
             token.blacklist()
             
             return Response({
@@ -175,32 +208,44 @@ class UserListView(APIView):
             role = request.query_params.get('role', None)
             department = request.query_params.get('department', None)
             
+            # Fuse role/department/RBAC conditions into one Q so a single
+            # indexed query runs
+            q = Q()
+
             # Filter users by role if provided
             if role:
-                users = User.objects.filter(role=role).order_by('last_name', 'first_name')
-            else:
-                users = User.objects.all().order_by('last_name', 'first_name')
-            
+                q &= Q(role=role)
+
             # Filter by department if provided (for cascading dropdowns)
             if department and department != 'all':
-                users = users.filter(department=department)
-            
+                q &= Q(department=department)
+
             # RBAC: Department head restrictions for faculty list
             elif role == 'faculty' and request.user.admin_subrole:
                 if request.user.admin_subrole == 'dept_head_cs':
                     # CS Department Head: only CS faculty
-                    users = users.filter(department='CS')
+                    q &= Q(department='CS')
                 elif request.user.admin_subrole == 'dept_head_it':
                     # IT Department Head: IT and ACT faculty
-                    users = users.filter(department__in=['IT', 'ACT'])
+                    q &= Q(department__in=['IT', 'ACT'])
                 # dean has no restrictions (sees all)
-            
-            # Serialize the users
-            serializer = UserSerializer(users, many=True)
-            
+
+            users = User.objects.filter(q).order_by('last_name', 'first_name')
+
+            # Read-only list: skip DRF field dispatch and serialize straight
+            # from values() rows, deriving display_name from the raw columns
+            rows = list(users.values(
+                'id', 'email', 'username', 'role', 'admin_subrole', 'student_id',
+                'department', 'is_active', 'created_at', 'first_name', 'last_name'
+            ))
+            for row in rows:
+                row['display_name'] = display_name_for(
+                    row['email'], row['role'], row.pop('first_name'), row.pop('last_name')
+                )
+
             return Response({
                 'success': True,
-                'data': serializer.data
+                'data': rows
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
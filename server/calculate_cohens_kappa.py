@@ -5,15 +5,14 @@ This script calculates Cohen's Kappa coefficient for pairwise annotator agreemen
 Cohen's Kappa measures agreement between two annotators.
 """
 
+import io
 import pandas as pd
 import numpy as np
-from sklearn.metrics import cohen_kappa_score, confusion_matrix
 import sys
 import os
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
-    import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 def interpret_kappa(kappa):
@@ -35,31 +34,61 @@ def calculate_cohens_kappa(csv_file):
     """
     Calculate Cohen's Kappa for all annotator pairs
     """
-    print("=" * 100)
-    print("COHEN'S KAPPA INTER-RATER RELIABILITY ANALYSIS")
-    print("Student Feedback Emotion Classification")
-    print("=" * 100)
-    print()
-    
-    # Load data
-    print(f"📂 Loading data from: {csv_file}")
-    df = pd.read_csv(csv_file)
-    print(f"✅ Loaded {len(df)} annotations")
-    print()
+    # Accumulate the report and write it to stdout in one go at the end,
+    # instead of one buffered write + flush per print()
+    buf = io.StringIO()
+
+    def echo(line=''):
+        buf.write(f'{line}\n')
+
+    echo("=" * 100)
+    echo("COHEN'S KAPPA INTER-RATER RELIABILITY ANALYSIS")
+    echo("Student Feedback Emotion Classification")
+    echo("=" * 100)
+    echo()
     
     # Get annotators
     annotators = ['annotator_1', 'annotator_2', 'annotator_3']
-    
-    # Get emotion categories
-    emotions = sorted(set(df['annotator_1'].unique()) | 
-                     set(df['annotator_2'].unique()) | 
-                     set(df['annotator_3'].unique()))
-    
-    print(f"📊 Dataset Information:")
-    print(f"   • Total annotations: {len(df)}")
-    print(f"   • Number of annotators: 3")
-    print(f"   • Emotion categories: {', '.join(emotions)}")
-    print()
+
+    # Load data - only the columns we use, with the label columns stored as
+    # categoricals (int codes + one string table) instead of per-row strings
+    echo(f"📂 Loading data from: {csv_file}")
+    wanted = {'feedback_id', 'feedback_text', *annotators}
+    df = pd.read_csv(
+        csv_file,
+        usecols=lambda c: c in wanted,
+        dtype={a: 'category' for a in annotators}
+    )
+    echo(f"✅ Loaded {len(df)} annotations")
+    echo()
+
+    # Get emotion categories and align all three columns on the same set
+    emotions = sorted(set().union(*(df[a].cat.categories for a in annotators)))
+    for a in annotators:
+        df[a] = df[a].cat.set_categories(emotions)
+
+    # Encode labels to int8 codes once - every kappa, confusion matrix, and
+    # agreement mask below works off this array instead of re-factorizing
+    # the string columns
+    codes = np.stack(
+        [df[a].cat.codes.to_numpy(dtype=np.int8) for a in annotators],
+        axis=1
+    )
+    n_rows = len(df)
+    n_emotions = len(emotions)
+    col_idx = {a: i for i, a in enumerate(annotators)}
+
+    def pair_confusion(ann1, ann2):
+        """Confusion matrix between two annotators from the encoded codes."""
+        cm = np.zeros((n_emotions, n_emotions), dtype=np.int64)
+        np.add.at(cm, (codes[:, col_idx[ann1]], codes[:, col_idx[ann2]]), 1)
+        return cm
+
+    echo(f"📊 Dataset Information:")
+    echo(f"   • Total annotations: {len(df)}")
+    echo(f"   • Number of annotators: 3")
+    echo(f"   • Emotion categories: {', '.join(emotions)}")
+    echo()
     
     # Calculate Cohen's Kappa for each pair
     pairs = [
@@ -69,18 +98,25 @@ def calculate_cohens_kappa(csv_file):
     ]
     
     results = []
-    
-    print("=" * 100)
-    print("🎯 COHEN'S KAPPA RESULTS (Pairwise Agreement)")
-    print("=" * 100)
-    print()
-    
+    pair_cms = {}
+
+    echo("=" * 100)
+    echo("🎯 COHEN'S KAPPA RESULTS (Pairwise Agreement)")
+    echo("=" * 100)
+    echo()
+
     for ann1, ann2, pair_name in pairs:
-        kappa = cohen_kappa_score(df[ann1], df[ann2])
+        # One confusion matrix per pair drives kappa, raw agreement,
+        # and the matrix display further down
+        cm = pair_confusion(ann1, ann2)
+        pair_cms[(ann1, ann2)] = cm
+
+        agreement = int(np.trace(cm))
+        observed = agreement / n_rows
+        expected = (cm.sum(axis=0) * cm.sum(axis=1)).sum() / n_rows ** 2
+        kappa = (observed - expected) / (1 - expected)
         interpretation = interpret_kappa(kappa)
-        
-        # Calculate raw agreement
-        agreement = (df[ann1] == df[ann2]).sum()
+
         agreement_pct = (agreement / len(df)) * 100
         
         results.append({
@@ -91,108 +127,105 @@ def calculate_cohens_kappa(csv_file):
             'agreement_pct': agreement_pct
         })
         
-        print(f"📊 {pair_name}")
-        print(f"   Cohen's Kappa: {kappa:.4f}")
-        print(f"   Interpretation: {interpretation}")
-        print(f"   Raw Agreement: {agreement}/{len(df)} ({agreement_pct:.2f}%)")
-        print()
+        echo(f"📊 {pair_name}")
+        echo(f"   Cohen's Kappa: {kappa:.4f}")
+        echo(f"   Interpretation: {interpretation}")
+        echo(f"   Raw Agreement: {agreement}/{len(df)} ({agreement_pct:.2f}%)")
+        echo()
     
     # Calculate average Cohen's Kappa
     avg_kappa = np.mean([r['kappa'] for r in results])
     avg_agreement = np.mean([r['agreement_pct'] for r in results])
     
-    print("=" * 100)
-    print("📈 OVERALL SUMMARY")
-    print("=" * 100)
-    print(f"   Average Cohen's Kappa: {avg_kappa:.4f}")
-    print(f"   Average Agreement: {avg_agreement:.2f}%")
-    print(f"   Interpretation: {interpret_kappa(avg_kappa)}")
-    print()
+    echo("=" * 100)
+    echo("📈 OVERALL SUMMARY")
+    echo("=" * 100)
+    echo(f"   Average Cohen's Kappa: {avg_kappa:.4f}")
+    echo(f"   Average Agreement: {avg_agreement:.2f}%")
+    echo(f"   Interpretation: {interpret_kappa(avg_kappa)}")
+    echo()
     
     # Show confusion matrix for each pair
-    print("=" * 100)
-    print("📊 CONFUSION MATRICES")
-    print("=" * 100)
-    print()
+    echo("=" * 100)
+    echo("📊 CONFUSION MATRICES")
+    echo("=" * 100)
+    echo()
     
     for ann1, ann2, pair_name in pairs:
-        print(f"🔍 {pair_name}")
-        print()
-        cm = confusion_matrix(df[ann1], df[ann2], labels=emotions)
-        
+        echo(f"🔍 {pair_name}")
+        echo()
+        cm = pair_cms[(ann1, ann2)]
+
         # Create DataFrame for better display
         cm_df = pd.DataFrame(cm, index=emotions, columns=emotions)
         cm_df.index.name = f'{ann1}'
         cm_df.columns.name = f'{ann2}'
         
-        print(cm_df.to_string())
-        print()
+        echo(cm_df.to_string())
+        echo()
     
     # Emotion distribution
-    print("=" * 100)
-    print("📊 EMOTION DISTRIBUTION BY ANNOTATOR")   
-    print("=" * 100)
-    print()
+    echo("=" * 100)
+    echo("📊 EMOTION DISTRIBUTION BY ANNOTATOR")   
+    echo("=" * 100)
+    echo()
     
     for annotator in annotators:
-        print(f"📋 {annotator.replace('_', ' ').title()}")
+        echo(f"📋 {annotator.replace('_', ' ').title()}")
         emotion_counts = df[annotator].value_counts().sort_index()
         for emotion, count in emotion_counts.items():
             percentage = (count / len(df)) * 100
-            print(f"   {emotion.capitalize():15s}: {count:4d} ({percentage:5.2f}%)")
-        print()
-    
-    # Perfect agreement (all 3 agree)
-    perfect_agreement = df[
-        (df['annotator_1'] == df['annotator_2']) & 
-        (df['annotator_2'] == df['annotator_3'])
-    ]
-    perfect_pct = (len(perfect_agreement) / len(df)) * 100
-    
-    print("=" * 100)
-    print("✅ PERFECT AGREEMENT (All 3 Annotators)")
-    print("=" * 100)
-    print(f"   Total: {len(perfect_agreement)}/{len(df)} ({perfect_pct:.2f}%)")
-    print()
-    
-    # Disagreements
-    disagreements = df[
-        (df['annotator_1'] != df['annotator_2']) | 
-        (df['annotator_2'] != df['annotator_3']) | 
-        (df['annotator_1'] != df['annotator_3'])
-    ]
+            echo(f"   {emotion.capitalize():15s}: {count:4d} ({percentage:5.2f}%)")
+        echo()
     
-    if len(disagreements) > 0:
-        print("=" * 100)
-        print(f"⚠️  DISAGREEMENTS ({len(disagreements)} cases)")
-        print("=" * 100)
-        print()
-        print("Sample disagreements:")
-        for idx, row in disagreements.head(10).iterrows():
+    # Perfect agreement (all 3 agree) - one pass over the encoded codes
+    perfect_mask = (codes[:, 0] == codes[:, 1]) & (codes[:, 1] == codes[:, 2])
+    perfect_count = int(perfect_mask.sum())
+    perfect_pct = (perfect_count / len(df)) * 100
+
+    echo("=" * 100)
+    echo("✅ PERFECT AGREEMENT (All 3 Annotators)")
+    echo("=" * 100)
+    echo(f"   Total: {perfect_count}/{len(df)} ({perfect_pct:.2f}%)")
+    echo()
+
+    # Disagreements are just the complement of the perfect mask
+    disagree_idx = np.flatnonzero(~perfect_mask)
+
+    if len(disagree_idx) > 0:
+        echo("=" * 100)
+        echo(f"⚠️  DISAGREEMENTS ({len(disagree_idx)} cases)")
+        echo("=" * 100)
+        echo()
+        echo("Sample disagreements:")
+        # Materialize only the ten displayed rows, not a filtered DataFrame
+        for _, row in df.iloc[disagree_idx[:10]].iterrows():
             if 'feedback_text' in df.columns:
                 text = row['feedback_text'][:60] + "..." if len(row['feedback_text']) > 60 else row['feedback_text']
-                print(f"  {row['feedback_id']}: {text}")
+                echo(f"  {row['feedback_id']}: {text}")
             else:
-                print(f"  {row['feedback_id']}")
-            print(f"    Annotator 1: {row['annotator_1']:15} | Annotator 2: {row['annotator_2']:15} | Annotator 3: {row['annotator_3']}")
-            print()
-    
-    print("=" * 100)
-    print("📖 KAPPA INTERPRETATION GUIDE")
-    print("=" * 100)
-    print("   < 0.00  : Poor agreement (worse than chance)")
-    print("   0.00-0.20: Slight agreement")
-    print("   0.21-0.40: Fair agreement")
-    print("   0.41-0.60: Moderate agreement")
-    print("   0.61-0.80: Substantial agreement")
-    print("   0.81-1.00: Almost perfect agreement")
-    print()
-    
-    print("=" * 100)
-    print("✅ Analysis Complete!")
-    print("=" * 100)
-    print()
-    
+                echo(f"  {row['feedback_id']}")
+            echo(f"    Annotator 1: {row['annotator_1']:15} | Annotator 2: {row['annotator_2']:15} | Annotator 3: {row['annotator_3']}")
+            echo()
+    
+    echo("=" * 100)
+    echo("📖 KAPPA INTERPRETATION GUIDE")
+    echo("=" * 100)
+    echo("   < 0.00  : Poor agreement (worse than chance)")
+    echo("   0.00-0.20: Slight agreement")
+    echo("   0.21-0.40: Fair agreement")
+    echo("   0.41-0.60: Moderate agreement")
+    echo("   0.61-0.80: Substantial agreement")
+    echo("   0.81-1.00: Almost perfect agreement")
+    echo()
+    
+    echo("=" * 100)
+    echo("✅ Analysis Complete!")
+    echo("=" * 100)
+    echo()
+
+    sys.stdout.write(buf.getvalue())
+
     return results, avg_kappa
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
+from django.contrib.auth.hashers import make_password
 from django.core.management import call_command
 from authentication.models import User
 from api.models import Course, CourseAssignment, Enrollment, FeedbackSession
@@ -29,34 +30,36 @@ print("-" * 70)
 
 departments = ['CS', 'IT', 'ACT']
 faculty_per_dept = 10
-faculty_created = 0
-faculty_updated = 0
-
-for dept in departments:
-    for i in range(1, faculty_per_dept + 1):
-        email = f'faculty{dept}{i}@wmsu.edu.ph'
-        username = f'faculty_{dept.lower()}_{i}'
-        
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={
-                'username': username,
-                'first_name': f'{dept} Faculty',
-                'last_name': f'{i}',
-                'role': 'faculty',
-                'department': dept,
-                'is_staff': False,
-                'is_superuser': False
-            }
-        )
-        
-        user.set_password('Faculty@123')
-        user.save()
-        
-        if created:
-            faculty_created += 1
-        else:
-            faculty_updated += 1
+
+# Same password for every faculty account - hash it once
+hashed_password = make_password('Faculty@123')
+
+planned_faculty = [
+    User(
+        email=f'faculty{dept}{i}@wmsu.edu.ph',
+        username=f'faculty_{dept.lower()}_{i}',
+        password=hashed_password,
+        first_name=f'{dept} Faculty',
+        last_name=f'{i}',
+        role='faculty',
+        department=dept,
+        is_staff=False,
+        is_superuser=False
+    )
+    for dept in departments
+    for i in range(1, faculty_per_dept + 1)
+]
+
+with transaction.atomic():
+    # Insert the missing accounts in one batch, reset passwords on the rest
+    existing = set(
+        User.objects.filter(email__in=[u.email for u in planned_faculty])
+        .values_list('email', flat=True)
+    )
+    new_faculty = [u for u in planned_faculty if u.email not in existing]
+    User.objects.bulk_create(new_faculty, batch_size=500, ignore_conflicts=True)
+    faculty_created = len(new_faculty)
+    faculty_updated = User.objects.filter(email__in=existing).update(password=hashed_password)
 
 print(f"✅ Faculty: {faculty_created} created, {faculty_updated} updated")
 
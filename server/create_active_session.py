@@ -8,10 +8,16 @@ from datetime import datetime, timedelta
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
-from api.models import FeedbackSession
+from django.db import transaction
 
-# Delete old sessions
-FeedbackSession.objects.all().delete()
+from api.models import Feedback, FeedbackSession
+
+# Delete old sessions with raw batch deletes - skips the collector and
+# delete signals, which is fine for this test-only reset. Every Feedback
+# row references a session, so clear those first to satisfy the FK.
+with transaction.atomic():
+    Feedback.objects.all()._raw_delete(Feedback.objects.db)
+    FeedbackSession.objects.all()._raw_delete(FeedbackSession.objects.db)
 
 # Create new active session
 start_date = datetime.now()
@@ -28,9 +28,10 @@ print(f"Testing as faculty: {faculty.email}\n")
 # Get their course assignments
 from api.models import CourseAssignment
 assignments = CourseAssignment.objects.filter(instructor=faculty)
-print(f"Faculty has {assignments.count()} course assignments")
+assignment_count = assignments.count()
+print(f"Faculty has {assignment_count} course assignments")
 
-if assignments.count() == 0:
+if assignment_count == 0:
     print("ERROR: Faculty has no course assignments")
     exit(1)
 
@@ -40,34 +41,41 @@ enrollments_qs = Enrollment.objects.filter(
     status='enrolled'
 ).select_related('student', 'course_assignment__course')
 
-print(f"Total enrollments: {enrollments_qs.count()}\n")
+enrollment_count = enrollments_qs.count()
+print(f"Total enrollments: {enrollment_count}\n")
 
-if enrollments_qs.count() == 0:
+if enrollment_count == 0:
     print("ERROR: No enrollments found")
     exit(1)
 
 # Test the respondents query
 print("=== Testing Respondents Query ===")
-respondents = []
 respondent_ids = set()
 
-for enrollment in enrollments_qs[:5]:  # Test first 5
-    print(f"Checking enrollment: student={enrollment.student.email}, course={enrollment.course_assignment.course.name}")
-    
-    try:
-        feedback = Feedback.objects.filter(
-            student=enrollment.student,
-            course_assignment=enrollment.course_assignment,
-            status='submitted'
-        ).first()
-        
-        if feedback:
-            print(f"  ✓ Found feedback, created: {feedback.created_at}")
-            respondent_ids.add(enrollment.student.id)
-        else:
-            print(f"  ✗ No feedback found")
-    except Exception as e:
-        print(f"  ERROR: {e}")
+# One projected query for the previewed enrollments, one for their
+# submitted feedback - instead of a Feedback lookup per enrollment
+preview = list(enrollments_qs.values_list(
+    'student_id', 'course_assignment_id', 'student__email', 'course_assignment__course__name'
+)[:5])  # Test first 5
+
+submitted = {
+    (sid, aid): created
+    for sid, aid, created in Feedback.objects.filter(
+        status='submitted',
+        student_id__in=[p[0] for p in preview],
+        course_assignment_id__in=[p[1] for p in preview],
+    ).values_list('student_id', 'course_assignment_id', 'created_at')
+}
+
+for student_id, assignment_id, email, course_name in preview:
+    print(f"Checking enrollment: student={email}, course={course_name}")
+
+    created_at = submitted.get((student_id, assignment_id))
+    if created_at:
+        print(f"  ✓ Found feedback, created: {created_at}")
+        respondent_ids.add(student_id)
+    else:
+        print(f"  ✗ No feedback found")
 
 print(f"\nTotal respondents found: {len(respondent_ids)}")
 
@@ -75,11 +83,13 @@ print(f"\nTotal respondents found: {len(respondent_ids)}")
 print("\n=== Testing Submissions Over Time Query ===")
 thirty_days_ago = datetime.now() - timedelta(days=30)
 
-student_ids = enrollments_qs.values_list('student_id', flat=True)
-assignment_ids = enrollments_qs.values_list('course_assignment_id', flat=True)
+# Materialize the id lists once; reusing the Python lists below makes
+# Django inline them as IN (...) instead of re-running the queryset
+student_ids = list(enrollments_qs.values_list('student_id', flat=True).distinct())
+assignment_ids = list(enrollments_qs.values_list('course_assignment_id', flat=True).distinct())
 
-print(f"Student IDs count: {len(list(student_ids))}")
-print(f"Assignment IDs count: {len(list(assignment_ids))}")
+print(f"Student IDs count: {len(student_ids)}")
+print(f"Assignment IDs count: {len(assignment_ids)}")
 
 try:
     submissions_by_date = Feedback.objects.filter(
@@ -90,9 +100,11 @@ try:
     ).annotate(
         date=TruncDate('created_at')
     ).values('date').annotate(count=Count('id')).order_by('date')
-    
-    print(f"Submissions found: {submissions_by_date.count()}")
-    for item in submissions_by_date[:10]:
+
+    # Run the aggregation once; .count() would re-execute the whole GROUP BY
+    rows = list(submissions_by_date)
+    print(f"Submissions found: {len(rows)}")
+    for item in rows[:10]:
         print(f"  Date: {item['date']}, Count: {item['count']}")
         
 except Exception as e:
@@ -7,22 +7,51 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
-from api.models import CourseAssignment
+from collections import defaultdict
+
+from django.db import transaction
+
+from api.models import CourseAssignment, Enrollment
+from authentication.models import User
 
 print("="*80)
 print("AUTO-ENROLLING STUDENTS")
 print("="*80)
 
-assignments = CourseAssignment.objects.all()
-print(f"\nFound {assignments.count()} course assignments")
+assignments = CourseAssignment.objects.select_related('course')
+total_assignments = assignments.count()  # captured once; the loop streams
+print(f"\nFound {total_assignments} course assignments")
 
+# One student query grouped by (department, year) replaces the per-assignment
+# lookups inside auto_enroll_students()
+students_by_key = defaultdict(list)
+student_rows = User.objects.filter(role='student', is_active=True).values_list(
+    'id', 'department', 'year_level', 'section'
+)
+for sid, s_dept, s_year, s_section in student_rows:
+    students_by_key[(s_dept, s_year)].append((sid, s_section))
+
+pending = []
 count = 0
-for assignment in assignments:
+# Stream assignments in chunks so peak memory stays bounded as the table grows
+for assignment in assignments.iterator(chunk_size=500):
     print(f"\nProcessing: {assignment.course.code} Section {assignment.section}")
-    assignment.auto_enroll_students()
+    for sid, s_section in students_by_key.get((assignment.department, assignment.year_level), []):
+        if assignment.section and s_section != assignment.section:
+            continue
+        pending.append(Enrollment(
+            student_id=sid,
+            course_assignment_id=assignment.id,
+            is_auto_enrolled=True,
+            status='enrolled'
+        ))
     count += 1
     if count % 20 == 0:
-        print(f"  ... processed {count}/{assignments.count()}")
+        print(f"  ... processed {count}/{total_assignments}")
+
+# One batched INSERT; existing (student, assignment) pairs are skipped
+with transaction.atomic():
+    Enrollment.objects.bulk_create(pending, batch_size=1000, ignore_conflicts=True)
 
 print("\n" + "="*80)
 print(f"✅ COMPLETED: Processed {count} course assignments")
@@ -11,32 +11,18 @@ django.setup()
 
 from api.models import CourseAssignment, Enrollment
 from authentication.models import User
+from rename_ict_to_act import rename_department
 
 print("=== Checking Department Issues ===\n")
 
-# 1. Check ICT vs ACT
-ict_assignments = CourseAssignment.objects.filter(department='ICT').count()
-act_assignments = CourseAssignment.objects.filter(department='ACT').count()
+# 1. Rename any leftover ICT rows to ACT - one atomic helper shared with
+# rename_ict_to_act.py instead of duplicated per-table updates
+renamed = rename_department('ICT', 'ACT')
+print(f"Renamed ICT → ACT: {renamed['users']} users, "
+      f"{renamed['courses']} courses, {renamed['assignments']} assignments\n")
 
-print(f"ICT assignments: {ict_assignments}")
-print(f"ACT assignments: {act_assignments}\n")
-
-if ict_assignments > 0:
-    print(f"Renaming {ict_assignments} ICT assignments to ACT...")
-    CourseAssignment.objects.filter(department='ICT').update(department='ACT')
-    print("✓ Done\n")
-
-# 2. Check ICT users
-ict_users = User.objects.filter(department='ICT').count()
-act_users = User.objects.filter(department='ACT').count()
-
-print(f"ICT users: {ict_users}")
-print(f"ACT users: {act_users}\n")
-
-if ict_users > 0:
-    print(f"Renaming {ict_users} ICT users to ACT...")
-    User.objects.filter(department='ICT').update(department='ACT')
-    print("✓ Done\n")
+print(f"ACT assignments: {CourseAssignment.objects.filter(department='ACT').count()}")
+print(f"ACT users: {User.objects.filter(department='ACT').count()}\n")
 
 # 3. Check enrollments per department
 print("=== Enrollment Counts by Department ===\n")
@@ -53,15 +39,16 @@ for item in enrollment_counts:
 
 # 4. Check active ACT assignments with students
 print("\n=== Active ACT Assignments with Enrollments ===\n")
+# select_related avoids a course query per row; the enrollment count is
+# annotated into the same SELECT instead of one COUNT query per assignment
 act_assignments_active = CourseAssignment.objects.filter(
     department='ACT',
     is_active=True
-)
+).select_related('course').annotate(enr_count=Count('enrollments'))
 
 print(f"Active ACT assignments: {act_assignments_active.count()}")
 
 for assignment in act_assignments_active[:5]:
-    enrollment_count = Enrollment.objects.filter(course_assignment=assignment).count()
-    print(f"  {assignment.course.code} Section {assignment.section}: {enrollment_count} students")
+    print(f"  {assignment.course.code} Section {assignment.section}: {assignment.enr_count} students")
 
 print("\n=== Complete ===")
@@ -7,6 +7,7 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
+from django.db.models.functions import Substr
 from authentication.models import User
 
 print("="*80)
@@ -16,17 +17,15 @@ print("="*80)
 students = User.objects.filter(role='student')
 print(f"\nFound {students.count()} students")
 
-updated = 0
-for student in students:
-    if student.section and len(student.section) > 1 and student.section[0].isdigit():
-        old_section = student.section
-        # Remove year prefix (e.g., '1A' -> 'A', '2B' -> 'B')
-        new_section = student.section[1:]
-        student.section = new_section
-        student.save()
-        updated += 1
-        if updated <= 5:  # Show first 5 examples
-            print(f"  {student.email}: {old_section} → {new_section}")
+# Sections with a year prefix: a digit followed by at least one more char
+to_fix = students.filter(section__regex=r'^\d.')
+
+# Grab examples before the update rewrites them
+for email, section in to_fix.values_list('email', 'section')[:5]:
+    print(f"  {email}: {section} → {section[1:]}")
+
+# Strip the prefix server-side in one UPDATE (e.g., '1A' -> 'A')
+updated = to_fix.update(section=Substr('section', 2))
 
 print(f"\n✅ Updated {updated} student sections")
 print("="*80)
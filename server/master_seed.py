@@ -8,6 +8,7 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
+from django.contrib.auth.hashers import make_password
 from django.core.management import call_command
 from authentication.models import User
 from api.models import Course, CourseAssignment, FeedbackSession
@@ -26,31 +27,35 @@ faculty_per_dept = 10
 faculty_created = 0
 faculty_updated = 0
 
-for dept in departments:
-    for i in range(1, faculty_per_dept + 1):
-        email = f'faculty{dept}{i}@wmsu.edu.ph'
-        username = f'faculty_{dept.lower()}_{i}'
-        
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={
-                'username': username,
-                'first_name': f'{dept} Faculty',
-                'last_name': f'{i}',
-                'role': 'faculty',
-                'department': dept,
-                'is_staff': False,
-                'is_superuser': False
-            }
-        )
-        
-        user.set_password('Faculty@123')
-        user.save()
-        
-        if created:
-            faculty_created += 1
-        else:
-            faculty_updated += 1
+# Hash the shared password once (bcrypt per call is the expensive part) and
+# commit the whole step as one transaction instead of two per user
+hashed_password = make_password('Faculty@123')
+
+with transaction.atomic():
+    for dept in departments:
+        for i in range(1, faculty_per_dept + 1):
+            email = f'faculty{dept}{i}@wmsu.edu.ph'
+            username = f'faculty_{dept.lower()}_{i}'
+
+            user, created = User.objects.get_or_create(
+                email=email,
+                defaults={
+                    'username': username,
+                    'first_name': f'{dept} Faculty',
+                    'last_name': f'{i}',
+                    'role': 'faculty',
+                    'department': dept,
+                    'is_staff': False,
+                    'is_superuser': False,
+                    'password': hashed_password
+                }
+            )
+
+            if created:
+                faculty_created += 1
+            else:
+                User.objects.filter(pk=user.pk).update(password=hashed_password)
+                faculty_updated += 1
 
 print(f"✅ Faculty Ready: {faculty_created} created, {faculty_updated} updated")
 
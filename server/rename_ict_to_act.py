@@ -7,32 +7,43 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
+from django.db import transaction
+
 from authentication.models import User
 from api.models import Course, CourseAssignment
 
-print("="*80)
-print("RENAMING ICT DEPARTMENT TO ACT")
-print("="*80)
-
-# Update users
-users_updated = User.objects.filter(department='ICT').update(department='ACT')
-print(f"\n✓ Updated {users_updated} users from ICT to ACT")
-
-# Update courses
-courses_updated = Course.objects.filter(department='ICT').update(department='ACT')
-print(f"✓ Updated {courses_updated} courses from ICT to ACT")
-
-# Update course assignments
-assignments_updated = CourseAssignment.objects.filter(department='ICT').update(department='ACT')
-print(f"✓ Updated {assignments_updated} course assignments from ICT to ACT")
-
-print("\n" + "="*80)
-print("✅ RENAMING COMPLETE!")
-print("="*80)
 
-# Show summary
-print(f"\n📊 Final counts:")
-print(f"  - CS users: {User.objects.filter(department='CS').count()}")
-print(f"  - IT users: {User.objects.filter(department='IT').count()}")
-print(f"  - ACT users: {User.objects.filter(department='ACT').count()}")
-print(f"  - ICT users (should be 0): {User.objects.filter(department='ICT').count()}")
+def rename_department(old, new):
+    """Rename a department across users, courses and assignments.
+
+    One transaction (one commit) instead of three, and idempotent - rerunning
+    after the rename is a no-op. Shared with fix_act_and_enrollments.py.
+    """
+    with transaction.atomic():
+        return {
+            'users': User.objects.filter(department=old).update(department=new),
+            'courses': Course.objects.filter(department=old).update(department=new),
+            'assignments': CourseAssignment.objects.filter(department=old).update(department=new),
+        }
+
+
+if __name__ == '__main__':
+    print("="*80)
+    print("RENAMING ICT DEPARTMENT TO ACT")
+    print("="*80)
+
+    updated = rename_department('ICT', 'ACT')
+    print(f"\n✓ Updated {updated['users']} users from ICT to ACT")
+    print(f"✓ Updated {updated['courses']} courses from ICT to ACT")
+    print(f"✓ Updated {updated['assignments']} course assignments from ICT to ACT")
+
+    print("\n" + "="*80)
+    print("✅ RENAMING COMPLETE!")
+    print("="*80)
+
+    # Show summary
+    print(f"\n📊 Final counts:")
+    print(f"  - CS users: {User.objects.filter(department='CS').count()}")
+    print(f"  - IT users: {User.objects.filter(department='IT').count()}")
+    print(f"  - ACT users: {User.objects.filter(department='ACT').count()}")
+    print(f"  - ICT users (should be 0): {User.objects.filter(department='ICT').count()}")
@@ -8,20 +8,21 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
+from django.contrib.auth.hashers import make_password
 from authentication.models import User
 
 # Get all faculty users
 faculty_users = User.objects.filter(role='faculty')
+emails = list(faculty_users.values_list('email', flat=True))
 
-print(f"Found {faculty_users.count()} faculty users")
+print(f"Found {len(emails)} faculty users")
 print("\nResetting passwords...")
 
-reset_count = 0
-for user in faculty_users:
-    user.set_password('Faculty@123')
-    user.save()
-    print(f"✓ Reset password for: {user.email}")
-    reset_count += 1
+# Same plaintext for everyone: hash once, write once
+hashed = make_password('Faculty@123')
+reset_count = faculty_users.update(password=hashed)
+for email in emails:
+    print(f"✓ Reset password for: {email}")
 
 print(f"\n✅ Successfully reset {reset_count} faculty passwords")
 print("All faculty can now login with password: Faculty@123")
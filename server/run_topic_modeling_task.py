@@ -6,6 +6,7 @@ Runs periodically using Celery or can be triggered manually
 import os
 import django
 import logging
+import time
 from datetime import datetime
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
@@ -22,16 +23,31 @@ def should_run_topic_modeling():
     """
     Check if topic modeling should be run
     Run if:
-    - New feedback added since last run
+    - Last run is at least 10 minutes old
     - At least 10 feedbacks exist
     """
+    # File stat first: one syscall short-circuits before any DB work when
+    # the last run is recent
+    insights_file = Path(__file__).parent / 'results' / 'topic_modeling' / 'lda_insights.json'
+    if insights_file.exists():
+        # Plain float arithmetic - no datetime objects needed per poll
+        minutes_since_last_run = (time.time() - insights_file.stat().st_mtime) / 60.0
+        if minutes_since_last_run < 10:
+            logger.info(f"Last run was {minutes_since_last_run:.1f} minutes ago. Skipping.")
+            return False
+
+    # Cheap sliced existence probe before paying for a full COUNT(*)
+    if not Feedback.objects.filter(status='submitted')[:10].exists():
+        logger.info("No submitted feedback yet. Need at least 10 for topic modeling.")
+        return False
+
     feedback_count = Feedback.objects.filter(status='submitted').count()
-    
+
     # Need minimum feedbacks for meaningful topics
     if feedback_count < 10:
         logger.info(f"Only {feedback_count} feedbacks. Need at least 10 for topic modeling.")
         return False
-    
+
     return True
 
 
@@ -46,26 +62,23 @@ def run_topic_modeling_task():
         return {"status": "skipped", "reason": "Conditions not met"}
     
     try:
-        # Import here to avoid circular imports
-        import subprocess
-        import sys
-        
-        # Get Python executable from virtual environment
-        python_exe = sys.executable
-        script_path = Path(__file__).parent / 'run_lda_from_db.py'  # Use database script
-        
-        logger.info(f"Running LDA script: {script_path}")
-        
-        # Run the LDA script
-        result = subprocess.run(
-            [python_exe, str(script_path)],
-            cwd=Path(__file__).parent,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout
-        )
-        
-        if result.returncode == 0:
+        # Import here to avoid circular imports; running in-process skips a
+        # fresh interpreter start plus Django and model re-initialization
+        import io
+        from contextlib import redirect_stdout
+
+        from run_lda_from_db import main as run_lda
+
+        logger.info("Running LDA topic modeling in-process")
+
+        # The script reports progress with print(); keep it out of the
+        # server's stdout but available for debugging
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            completed = run_lda()
+        logger.debug(buffer.getvalue())
+
+        if completed:
             logger.info("✅ Topic modeling completed successfully")
             return {
                 "status": "success",
@@ -73,13 +86,13 @@ def run_topic_modeling_task():
                 "timestamp": datetime.now().isoformat()
             }
         else:
-            logger.error(f"Topic modeling failed: {result.stderr}")
+            logger.error("Topic modeling did not complete (not enough feedback)")
             return {
                 "status": "error",
-                "message": result.stderr,
+                "message": "Topic modeling did not complete",
                 "timestamp": datetime.now().isoformat()
             }
-            
+
     except Exception as e:
         logger.error(f"Error running topic modeling task: {str(e)}")
         return {
@@ -9,6 +9,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
 from authentication.models import User
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 
 # Department configurations
 departments = ['CS', 'IT', 'ICT']
@@ -17,37 +19,57 @@ faculty_per_dept = 10
 print("Creating/Updating Faculty Accounts...")
 print("=" * 50)
 
-faculty_created = 0
-faculty_updated = 0
-
-for dept in departments:
-    for i in range(1, faculty_per_dept + 1):
-        email = f'faculty{dept}{i}@wmsu.edu.ph'
-        username = f'faculty_{dept.lower()}_{i}'
-        
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={
-                'username': username,
-                'first_name': f'{dept} Faculty',
-                'last_name': f'{i}',
-                'role': 'faculty',
-                'department': dept,
-                'is_staff': False,
-                'is_superuser': False
-            }
+# Every account shares the same password, so hash once instead of running
+# bcrypt 30 times
+hashed_password = make_password('Faculty@123')
+
+accounts = [
+    {
+        'email': f'faculty{dept}{i}@wmsu.edu.ph',
+        'username': f'faculty_{dept.lower()}_{i}',
+        'first_name': f'{dept} Faculty',
+        'last_name': f'{i}',
+        'department': dept,
+    }
+    for dept in departments
+    for i in range(1, faculty_per_dept + 1)
+]
+
+# Three queries total: one fetch of existing accounts, one bulk insert of
+# the missing ones, one bulk password reset - instead of two round-trips
+# per account
+with transaction.atomic():
+    existing = User.objects.in_bulk([a['email'] for a in accounts], field_name='email')
+
+    new_users = [
+        User(
+            email=a['email'],
+            username=a['username'],
+            first_name=a['first_name'],
+            last_name=a['last_name'],
+            role='faculty',
+            department=a['department'],
+            is_staff=False,
+            is_superuser=False,
+            password=hashed_password
         )
-        
-        # Always set/reset password
-        user.set_password('Faculty@123')
-        user.save()
-        
-        if created:
-            faculty_created += 1
-            print(f'✓ Created: {email}')
-        else:
-            faculty_updated += 1
-            print(f'↻ Updated: {email}')
+        for a in accounts if a['email'] not in existing
+    ]
+    User.objects.bulk_create(new_users, ignore_conflicts=True)
+
+    # Always set/reset password on existing accounts
+    for user in existing.values():
+        user.password = hashed_password
+    User.objects.bulk_update(list(existing.values()), ['password'])
+
+for a in accounts:
+    if a['email'] in existing:
+        print(f'↻ Updated: {a["email"]}')
+    else:
+        print(f'✓ Created: {a["email"]}')
+
+faculty_created = len(new_users)
+faculty_updated = len(existing)
 
 print("\n" + "=" * 50)
 print(f"✅ Created: {faculty_created} new faculty")
@@ -0,0 +1,31 @@
+"""
+orjson-backed DRF renderer for faster JSON responses
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that serializes through orjson's C encoder when the
+    package is installed, falling back to the stock renderer otherwise
+    (and whenever an indent is requested, which orjson formats differently).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        # default=str covers Decimal and other types orjson rejects
+        return orjson.dumps(data, default=str)
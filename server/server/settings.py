@@ -229,11 +229,17 @@ SESSION_COOKIE_SECURE = False
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT auth with a cache-backed revocation fast path (see
+        # authentication/authentication.py)
+        'authentication.authentication.CachedBlacklistJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        # orjson-backed when available; falls back to stdlib json
+        'server.renderers.ORJSONRenderer',
+    ),
 }
 
 # JWT Settings
@@ -1,4 +1,5 @@
 import os
+import sys
 import django
 
 # Setup Django
@@ -11,46 +12,60 @@ print("="*80)
 print("ACTUAL FEEDBACK TEXT WITH MODEL PREDICTIONS")
 print("="*80)
 
-feedbacks = Feedback.objects.filter(status='submitted').order_by('-id')[:5]
+# One query instead of two extra SELECTs per feedback; only() trims the
+# row to the fields actually printed
+feedbacks = Feedback.objects.filter(status='submitted').select_related(
+    'student', 'course_assignment__course'
+).only(
+    'id', 'suggested_changes', 'best_teaching_aspect', 'least_teaching_aspect',
+    'further_comments', 'emotion_suggested_changes', 'emotion_best_aspect',
+    'emotion_least_aspect', 'emotion_further_comments', 'emotion_confidence_scores',
+    'student__first_name', 'student__last_name', 'course_assignment__course__name'
+).order_by('-id')[:5]
 
 for fb in feedbacks:
-    print(f"\n{'='*80}")
-    print(f"FEEDBACK ID: {fb.id}")
-    print(f"Student: {fb.student.get_full_name()}")
-    print(f"Course: {fb.course_assignment.course.name if fb.course_assignment else 'N/A'}")
-    print('='*80)
-    
+    # Collect the lines and emit them in one write per feedback instead of
+    # ~20 individual line-buffered prints
+    out = []
+    out.append(f"\n{'='*80}")
+    out.append(f"FEEDBACK ID: {fb.id}")
+    out.append(f"Student: {fb.student.get_full_name()}")
+    out.append(f"Course: {fb.course_assignment.course.name if fb.course_assignment else 'N/A'}")
+    out.append('='*80)
+
     if fb.suggested_changes:
-        print(f"\n📝 SUGGESTED CHANGES:")
-        print(f"   Text: \"{fb.suggested_changes}\"")
-        print(f"   🤖 Predicted Emotion: {fb.emotion_suggested_changes}")
+        out.append(f"\n📝 SUGGESTED CHANGES:")
+        out.append(f"   Text: \"{fb.suggested_changes}\"")
+        out.append(f"   🤖 Predicted Emotion: {fb.emotion_suggested_changes}")
         if fb.emotion_confidence_scores:
             conf = fb.emotion_confidence_scores.get('suggested_changes', {}).get('confidence', 0)
-            print(f"   Confidence: {conf:.2%}")
-    
+            out.append(f"   Confidence: {conf:.2%}")
+
     if fb.best_teaching_aspect:
-        print(f"\n✨ BEST TEACHING ASPECT:")
-        print(f"   Text: \"{fb.best_teaching_aspect}\"")
-        print(f"   🤖 Predicted Emotion: {fb.emotion_best_aspect}")
+        out.append(f"\n✨ BEST TEACHING ASPECT:")
+        out.append(f"   Text: \"{fb.best_teaching_aspect}\"")
+        out.append(f"   🤖 Predicted Emotion: {fb.emotion_best_aspect}")
         if fb.emotion_confidence_scores:
             conf = fb.emotion_confidence_scores.get('best_aspect', {}).get('confidence', 0)
-            print(f"   Confidence: {conf:.2%}")
-    
+            out.append(f"   Confidence: {conf:.2%}")
+
     if fb.least_teaching_aspect:
-        print(f"\n⚠️ LEAST TEACHING ASPECT:")
-        print(f"   Text: \"{fb.least_teaching_aspect}\"")
-        print(f"   🤖 Predicted Emotion: {fb.emotion_least_aspect}")
+        out.append(f"\n⚠️ LEAST TEACHING ASPECT:")
+        out.append(f"   Text: \"{fb.least_teaching_aspect}\"")
+        out.append(f"   🤖 Predicted Emotion: {fb.emotion_least_aspect}")
         if fb.emotion_confidence_scores:
             conf = fb.emotion_confidence_scores.get('least_aspect', {}).get('confidence', 0)
-            print(f"   Confidence: {conf:.2%}")
-    
+            out.append(f"   Confidence: {conf:.2%}")
+
     if fb.further_comments:
-        print(f"\n💬 FURTHER COMMENTS:")
-        print(f"   Text: \"{fb.further_comments}\"")
-        print(f"   🤖 Predicted Emotion: {fb.emotion_further_comments}")
+        out.append(f"\n💬 FURTHER COMMENTS:")
+        out.append(f"   Text: \"{fb.further_comments}\"")
+        out.append(f"   🤖 Predicted Emotion: {fb.emotion_further_comments}")
         if fb.emotion_confidence_scores:
             conf = fb.emotion_confidence_scores.get('further_comments', {}).get('confidence', 0)
-            print(f"   Confidence: {conf:.2%}")
+            out.append(f"   Confidence: {conf:.2%}")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 print("\n" + "="*80)
 print("\n✅ These are REAL predictions from your XLM-RoBERTa model!")
@@ -33,55 +33,62 @@ try:
         exit(0)
     
     # Get enrollments
-    enrollments_qs = Enrollment.objects.select_related(
-        'student', 'course_assignment', 'course_assignment__course', 'course_assignment__instructor'
-    ).filter(course_assignment__in=assignments)
-    
-    print(f"Total enrollments: {enrollments_qs.count()}")
-    
-    if enrollments_qs.count() == 0:
+    enrollments_qs = Enrollment.objects.filter(course_assignment__in=assignments)
+
+    enrollment_count = enrollments_qs.count()
+    print(f"Total enrollments: {enrollment_count}")
+
+    if enrollment_count == 0:
         print("No enrollments found")
         exit(0)
-    
-    # Get enrollment pairs
-    enrollment_list = list(enrollments_qs.values_list('student_id', 'course_assignment_id'))
+
+    # Get enrollment pairs - id tuples streamed in chunks, no Enrollment
+    # instances or joined rows materialized
+    enrollment_list = list(
+        enrollments_qs.values_list('student_id', 'course_assignment_id').iterator(chunk_size=500)
+    )
     print(f"Enrollment pairs: {len(enrollment_list)}\n")
     
     # Test the feedback query
     print("Testing feedback query...")
-    from django.db import models as django_models
-    
-    feedback_queries = [
-        django_models.Q(student_id=student_id, course_assignment_id=assignment_id)
-        for student_id, assignment_id in enrollment_list
-    ]
-    
-    if feedback_queries:
+
+    # Two indexed IN lookups instead of one OR-chain with a predicate per
+    # enrollment pair; the pair set filters out cross-product stragglers
+    pairs = set(enrollment_list)
+    student_ids = {student_id for student_id, _ in pairs}
+    assignment_ids = {assignment_id for _, assignment_id in pairs}
+
+    if pairs:
         feedback_qs = Feedback.objects.filter(
-            django_models.Q(*feedback_queries, _connector=django_models.Q.OR),
+            student_id__in=student_ids,
+            course_assignment_id__in=assignment_ids,
             status='submitted'
         ).select_related('student', 'course_assignment__course')
-        
+
         print(f"✓ Feedback query successful: {feedback_qs.count()} responses found\n")
-        
-        # Build lookup dict
+
+        # Build lookup dict, keeping only real enrollment pairs
         feedbacks = {}
         for feedback in feedback_qs:
             key = (feedback.student_id, feedback.course_assignment_id)
-            feedbacks[key] = feedback
+            if key in pairs:
+                feedbacks[key] = feedback
         
         # Count respondents and non-respondents
         respondents = []
         non_respondents = []
         
-        for enrollment in enrollments_qs[:10]:  # Test first 10
-            key = (enrollment.student.id, enrollment.course_assignment.id)
-            feedback = feedbacks.get(key)
-            
+        # Tuples again instead of full objects for the sample
+        sample = enrollments_qs.values_list(
+            'student_id', 'course_assignment_id', 'student__student_id'
+        )[:10]
+        for student_pk, assignment_id, student_number in sample:  # Test first 10
+            feedback = feedbacks.get((student_pk, assignment_id))
+
             if feedback:
-                respondents.append(enrollment.student.student_id)
+                respondents.append(student_number)
             else:
-                non_respondents.append(enrollment.student.student_id)
+                non_respondents.append(student_number)
         
         print(f"Sample results (first 10 enrollments):")
         print(f"  Respondents: {len(respondents)} - {respondents}")
@@ -90,6 +97,11 @@ try:
     print("\n✓ All queries work correctly!")
     
 except Exception as e:
+    # Only swallow and pretty-print when explicitly debugging; otherwise
+    # propagate so the traceback frames (and the querysets they pin) are
+    # released instead of being kept alive by the handler
+    if not os.environ.get('DEBUG_TEST'):
+        raise
     print(f"\n✗ ERROR: {type(e).__name__}")
     print(f"   Message: {str(e)}")
     traceback.print_exc()
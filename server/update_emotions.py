@@ -6,35 +6,71 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 django.setup()
 
 from api.models import Feedback
-from api.ml_models.emotion_predictor import predict_emotions_batch
+from api.ml_models.emotion_predictor import predict_emotions_batch, EMOTION_LABELS
+from django.db import transaction
+from django.db.models import Q
 
 print("="*80)
 print("UPDATING EXISTING FEEDBACK WITH EMOTION PREDICTIONS")
 print("="*80)
 
-# Get all submitted feedback without emotions
-feedbacks = Feedback.objects.filter(status='submitted')
+# Get all submitted feedback without emotions - rows already predicted on
+# a previous run are skipped entirely, and only() trims the fetch to the
+# fields read and written here
+feedbacks = Feedback.objects.filter(status='submitted').filter(
+    Q(emotion_suggested_changes__isnull=True) | Q(emotion_suggested_changes='')
+).only(
+    'id', 'suggested_changes', 'best_teaching_aspect',
+    'least_teaching_aspect', 'further_comments'
+)
 
 print(f"\nTotal submitted feedback: {feedbacks.count()}")
 
-# Update each feedback with emotion predictions
-updated_count = 0
-
-for fb in feedbacks:
-    # Collect text fields
-    texts = [
+# Flatten all four fields of every feedback into one prediction call so
+# the model sees a single large batch instead of four texts at a time
+feedbacks_list = list(feedbacks)
+all_texts = [
+    t for fb in feedbacks_list for t in (
         fb.suggested_changes or '',
         fb.best_teaching_aspect or '',
         fb.least_teaching_aspect or '',
         fb.further_comments or ''
-    ]
-    
+    )
+]
+
+# Many fields are empty or repeated boilerplate - predict each distinct
+# text once and look the rest up. Empty strings get the same fixed
+# 'acceptance' result the predictor returns for them, without a forward
+# pass. dict.fromkeys keeps first-seen order for a deterministic batch.
+unique_texts = [t for t in dict.fromkeys(all_texts) if t.strip()]
+
+print(f"\nPredicting emotions for {len(unique_texts)} distinct text fields "
+      f"({len(all_texts)} total)...")
+lookup = dict(zip(unique_texts, predict_emotions_batch(unique_texts, return_all_scores=True)))
+EMPTY_PREDICTION = {
+    'emotion': 'acceptance',
+    'confidence': 1.0,
+    'all_scores': {label: 0.0 for label in EMOTION_LABELS}
+}
+
+# Collect the modified rows for one batched write at the end instead of
+# an UPDATE per feedback
+to_update = []
+
+for fb in feedbacks_list:
     print(f"\nProcessing Feedback ID {fb.id}...")
-    
-    # Predict emotions
+
     try:
-        emotion_predictions = predict_emotions_batch(texts, return_all_scores=True)
-        
+        emotion_predictions = [
+            lookup.get(text, EMPTY_PREDICTION) if text.strip() else EMPTY_PREDICTION
+            for text in (
+                fb.suggested_changes or '',
+                fb.best_teaching_aspect or '',
+                fb.least_teaching_aspect or '',
+                fb.further_comments or ''
+            )
+        ]
+
         # Update the feedback
         fb.emotion_suggested_changes = emotion_predictions[0]['emotion']
         fb.emotion_best_aspect = emotion_predictions[1]['emotion']
@@ -64,9 +100,8 @@ for fb in feedbacks:
             }
         }
         
-        fb.save()
-        updated_count += 1
-        
+        to_update.append(fb)
+
         print(f"  ✓ Updated with emotions:")
         print(f"    - Suggested Changes: {emotion_predictions[0]['emotion']} ({emotion_predictions[0]['confidence']:.2f})")
         print(f"    - Best Aspect: {emotion_predictions[1]['emotion']} ({emotion_predictions[1]['confidence']:.2f})")
@@ -76,6 +111,16 @@ for fb in feedbacks:
     except Exception as e:
         print(f"  ✗ Error: {str(e)}")
 
+# One UPDATE per 500 rows inside a single transaction
+with transaction.atomic():
+    Feedback.objects.bulk_update(
+        to_update,
+        ['emotion_suggested_changes', 'emotion_best_aspect',
+         'emotion_least_aspect', 'emotion_further_comments',
+         'emotion_confidence_scores'],
+        batch_size=500
+    )
+
 print("\n" + "="*80)
-print(f"Successfully updated {updated_count} / {feedbacks.count()} feedback entries")
+print(f"Successfully updated {len(to_update)} / {feedbacks.count()} feedback entries")
 print("="*80)